@@ -21,10 +21,20 @@ from semantic_engine.ranking.ranker import (
     RankedCandidate,
     create_default_ranker
 )
-from semantic_engine.rendering.latex_renderer import (
-    LaTeXRenderer,
-    create_renderer
-)
+
+# The renderer pulls in matplotlib/PIL, so it is imported on first access
+# (PEP 562) rather than when the package is imported
+_LAZY_RENDERING_ATTRS = {"LaTeXRenderer", "create_renderer"}
+
+
+def __getattr__(name):
+    if name in _LAZY_RENDERING_ATTRS:
+        from semantic_engine.rendering import latex_renderer
+        value = getattr(latex_renderer, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "SemanticSuggestionEngine",
@@ -8,29 +8,61 @@ This script demonstrates how to use the complete suggestion system:
 """
 
 import numpy as np
+from typing import Optional
 from semantic_engine import create_suggestion_engine
 
-
-def simulate_vision_predictions(symbol_id: int, confidence: float = 0.9) -> np.ndarray:
+# Simulated predictions are drawn from a seeded generator so the example
+# output is reproducible; pass rng= to simulate_vision_predictions to override
+SIMULATION_SEED = 42
+_RNG = np.random.default_rng(SIMULATION_SEED)
+
+# Output templates, formatted with (rank, candidate)
+_DETAILED_LINE = (
+    "{0}. {1.latex_command:20} "
+    "(vision: {1.vision_confidence:.3f}, "
+    "math: {1.math_priority:.3f}, "
+    "combined: {1.combined_score:.3f})"
+)
+_CONTEXT_LINE = "   Context: {0.context}"
+_SCORE_LINE = "  {0}. {1.latex_command:20} (score: {1.combined_score:.3f})"
+
+
+def simulate_vision_predictions(
+    symbol_id: int,
+    confidence: float = 0.9,
+    out: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
     """
     Simulate Vision Engine predictions for a given symbol.
     
     Args:
         symbol_id: Symbol class ID (0-indexed, but our database uses actual IDs)
         confidence: Confidence score for the predicted symbol
+        out: Optional preallocated float32 or float64 array of shape (369,) to
+             fill, e.g. a row of a batch array. If None, a new float32 array is
+             allocated.
+        rng: Random generator for the noise (default: the module's generator,
+             seeded with SIMULATION_SEED)
     
     Returns:
-        Array of shape (369,) with predictions
+        Array of shape (369,) with predictions (out itself, if given)
     """
-    predictions = np.zeros(369)
+    if out is None:
+        # float32 is plenty for confidences in [0, 1] and the ranker keeps it
+        out = np.empty(369, dtype=np.float32)
+    if rng is None:
+        rng = _RNG
     # Note: symbol_id in our database might not match array index
     # This is a simplified simulation
-    if 0 <= symbol_id < 369:
-        predictions[symbol_id] = confidence
-        # Add some noise for other symbols
-        predictions += np.random.rand(369) * 0.1
-        # Normalize
-        predictions = predictions / predictions.sum()
+    if not 0 <= symbol_id < 369:
+        out.fill(0)
+        return out
+    # Noise for all symbols plus the predicted one, written and normalized in place
+    predictions = rng.random(out=out, dtype=out.dtype)
+    predictions *= 0.1
+    predictions[symbol_id] += confidence
+    predictions /= predictions.sum()
     return predictions
 
 
@@ -53,15 +85,14 @@ def example_basic_usage():
     print(f"\nVision Engine predicted symbol with confidence 0.85")
     print(f"Top {len(candidates)} LaTeX candidate suggestions:\n")
     
+    lines = []
     for i, cand in enumerate(candidates, 1):
-        print(f"{i}. {cand.latex_command:20} "
-              f"(vision: {cand.vision_confidence:.3f}, "
-              f"math: {cand.math_priority:.3f}, "
-              f"combined: {cand.combined_score:.3f})")
-        print(f"   Context: {cand.context}")
+        lines.append(_DETAILED_LINE.format(i, cand))
+        lines.append(_CONTEXT_LINE.format(cand))
         if cand.description:
-            print(f"   {cand.description}")
-        print()
+            lines.append("   " + cand.description)
+        lines.append("")
+    print("\n".join(lines))
 
 
 def example_multiple_symbols():
@@ -80,14 +111,20 @@ def example_multiple_symbols():
         (882, 0.95, "\\forall"),  # For all
     ]
     
-    for symbol_id, confidence, expected_latex in test_symbols:
-        print(f"\n--- Symbol ID {symbol_id} (expected: {expected_latex}) ---")
-        vision_output = simulate_vision_predictions(symbol_id, confidence)
-        candidates = engine.suggest_latex_candidates(vision_output, top_k=3)
-        
-        for i, cand in enumerate(candidates, 1):
-            print(f"  {i}. {cand.latex_command:20} "
-                  f"(score: {cand.combined_score:.3f}) - {cand.context}")
+    # Fill one preallocated batch row by row and rank it in one batched call
+    vision_outputs = np.empty((len(test_symbols), 369), dtype=np.float32)
+    for row, (symbol_id, confidence, _) in zip(vision_outputs, test_symbols):
+        simulate_vision_predictions(symbol_id, confidence, out=row)
+    batch_candidates = engine.suggest_latex_candidates_batch(vision_outputs, top_k=3)
+    
+    lines = []
+    for (symbol_id, _, expected_latex), candidates in zip(test_symbols, batch_candidates):
+        lines.append(f"\n--- Symbol ID {symbol_id} (expected: {expected_latex}) ---")
+        lines.extend(
+            _SCORE_LINE.format(i, cand) + " - " + cand.context
+            for i, cand in enumerate(candidates, 1)
+        )
+    print("\n".join(lines))
 
 
 def example_from_top_k():
@@ -114,12 +151,11 @@ def example_from_top_k():
     candidates = engine.suggest_from_top_k_symbols(top_k_symbols, top_k=5)
     
     print(f"\nTop {len(candidates)} ranked LaTeX candidates:\n")
+    lines = []
     for i, cand in enumerate(candidates, 1):
-        print(f"{i}. {cand.latex_command:20} "
-              f"(vision: {cand.vision_confidence:.3f}, "
-              f"math: {cand.math_priority:.3f}, "
-              f"combined: {cand.combined_score:.3f})")
-        print(f"   Context: {cand.context}")
+        lines.append(_DETAILED_LINE.format(i, cand))
+        lines.append(_CONTEXT_LINE.format(cand))
+    print("\n".join(lines))
 
 
 def example_custom_weights():
@@ -144,13 +180,11 @@ def example_custom_weights():
     
     print("\n--- Math-Heavy Ranking (40% vision, 60% math) ---")
     candidates_math = math_heavy_engine.suggest_latex_candidates(vision_output, top_k=3)
-    for i, cand in enumerate(candidates_math, 1):
-        print(f"  {i}. {cand.latex_command:20} (score: {cand.combined_score:.3f})")
+    print("\n".join(_SCORE_LINE.format(i, cand) for i, cand in enumerate(candidates_math, 1)))
     
     print("\n--- Vision-Heavy Ranking (80% vision, 20% math) ---")
     candidates_vision = vision_heavy_engine.suggest_latex_candidates(vision_output, top_k=3)
-    for i, cand in enumerate(candidates_vision, 1):
-        print(f"  {i}. {cand.latex_command:20} (score: {cand.combined_score:.3f})")
+    print("\n".join(_SCORE_LINE.format(i, cand) for i, cand in enumerate(candidates_vision, 1)))
 
 
 def main():
@@ -7,13 +7,57 @@ This module provides a unified interface for:
 3. Rendering previews for candidates
 """
 
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import functools
+import os
+import threading
 import numpy as np
 from pathlib import Path
 
-from semantic_engine.mapping_db.symbol_mapping import SymbolMappingDatabase
+from semantic_engine.mapping_db.symbol_mapping import SymbolMappingDatabase, get_default_db
 from semantic_engine.ranking.ranker import CandidateRanker, RankedCandidate
-from semantic_engine.rendering.latex_renderer import LaTeXRenderer, create_renderer
+
+if TYPE_CHECKING:
+    from semantic_engine.rendering.latex_renderer import LaTeXRenderer
+
+
+# Full mapping file, resolved once at import: prefer the precompiled .npz
+# snapshot and fall back to the JSON source
+_DEFAULT_MAPPING_PATH = Path(__file__).parent / "mapping_db" / "symbol_mapping_full.npz"
+if not _DEFAULT_MAPPING_PATH.is_file():
+    _DEFAULT_MAPPING_PATH = _DEFAULT_MAPPING_PATH.with_suffix(".json")
+_DEFAULT_MAPPING_EXISTS = _DEFAULT_MAPPING_PATH.is_file()
+
+_mapping_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_load(path: str, mtime: float) -> SymbolMappingDatabase:
+    """
+    Build the default database merged with a full mapping file.
+    
+    Cached on (path, mtime) so repeated engine construction parses the file once;
+    the returned database is shared and therefore frozen (see
+    SymbolMappingDatabase.freeze()).
+    """
+    mapping_db = SymbolMappingDatabase()
+    mapping_db.load_full_mapping(path)
+    return mapping_db.freeze()
+
+
+def _load_mapping_db(load_full_mapping: bool) -> SymbolMappingDatabase:
+    """Get the mapping database, optionally including the full mapping file."""
+    if load_full_mapping and _DEFAULT_MAPPING_EXISTS:
+        try:
+            with _mapping_cache_lock:
+                return _cached_load(
+                    str(_DEFAULT_MAPPING_PATH),
+                    os.path.getmtime(_DEFAULT_MAPPING_PATH)
+                )
+        except Exception as e:
+            print(f"Warning: Could not load full mapping database: {e}")
+            print("Using default mappings only.")
+    return get_default_db()
 
 
 class SemanticSuggestionEngine:
@@ -31,30 +75,21 @@ class SemanticSuggestionEngine:
         self,
         mapping_db: Optional[SymbolMappingDatabase] = None,
         ranker: Optional[CandidateRanker] = None,
-        renderer: Optional[LaTeXRenderer] = None,
+        renderer: Optional['LaTeXRenderer'] = None,
         load_full_mapping: bool = True
     ):
         """
         Initialize the Semantic Suggestion Engine.
         
         Args:
-            mapping_db: Symbol mapping database. If None, creates a new one.
+            mapping_db: Symbol mapping database. If None, uses the shared default one.
             ranker: Candidate ranker. If None, creates a default one.
             renderer: LaTeX renderer. If None, creates a default one.
             load_full_mapping: If True, loads the full mapping database from JSON file.
         """
         # Initialize mapping database
         if mapping_db is None:
-            mapping_db = SymbolMappingDatabase()
-            if load_full_mapping:
-                # Try to load full mapping database
-                full_mapping_path = Path(__file__).parent / "mapping_db" / "symbol_mapping_full.json"
-                if full_mapping_path.exists():
-                    try:
-                        mapping_db.load_full_mapping(str(full_mapping_path))
-                    except Exception as e:
-                        print(f"Warning: Could not load full mapping database: {e}")
-                        print("Using default mappings only.")
+            mapping_db = _load_mapping_db(load_full_mapping)
         
         self.mapping_db = mapping_db
         
@@ -84,16 +119,17 @@ class SemanticSuggestionEngine:
         Returns:
             List of RankedCandidate objects, sorted by combined score (descending)
         """
+        # Flatten (num_classes,) or (1, num_classes) once; a view when possible
+        vision_predictions = np.ascontiguousarray(vision_predictions).reshape(-1)
+        
         # Rank candidates
         candidates = self.ranker.rank_candidates(
             vision_predictions,
             top_k_symbols=5,  # Consider top 5 symbol classes
-            top_k_candidates_per_symbol=3  # Up to 3 LaTeX candidates per symbol
+            top_k_candidates_per_symbol=3,  # Up to 3 LaTeX candidates per symbol
+            display_k=top_k  # Limit to top_k
         )
         
-        # Limit to top_k
-        candidates = candidates[:top_k]
-        
         # Generate previews if requested
         if include_previews and self.renderer:
             # Note: Preview generation would be done here
@@ -103,6 +139,29 @@ class SemanticSuggestionEngine:
         
         return candidates
     
+    def suggest_latex_candidates_batch(
+        self,
+        vision_predictions: np.ndarray,
+        top_k: int = 10
+    ) -> List[List[RankedCandidate]]:
+        """
+        Get ranked LaTeX candidate suggestions for a batch of Vision Engine predictions.
+        
+        Args:
+            vision_predictions: Vision Engine outputs (logits or probabilities) of shape
+                               (batch_size, num_classes)
+            top_k: Maximum number of candidates to return per prediction
+        
+        Returns:
+            One list of RankedCandidate objects per prediction, sorted by combined score (descending)
+        """
+        return self.ranker.rank_candidates_batch(
+            vision_predictions,
+            top_k_symbols=5,  # Consider top 5 symbol classes
+            top_k_candidates_per_symbol=3,  # Up to 3 LaTeX candidates per symbol
+            display_k=top_k  # Limit to top_k
+        )
+    
     def suggest_from_top_k_symbols(
         self,
         top_k_symbols: List[Tuple[int, float]],
@@ -120,12 +179,11 @@ class SemanticSuggestionEngine:
         Returns:
             List of RankedCandidate objects, sorted by combined score (descending)
         """
-        candidates = self.ranker.rank_candidates_from_top_k(
+        return self.ranker.rank_candidates_from_top_k(
             top_k_symbols,
-            top_k_candidates_per_symbol=3
+            top_k_candidates_per_symbol=3,
+            display_k=top_k
         )
-        
-        return candidates[:top_k]
     
     def get_candidate_info(self, candidate: RankedCandidate) -> dict:
         """
@@ -189,14 +247,7 @@ def create_suggestion_engine(
     Returns:
         SemanticSuggestionEngine instance
     """
-    mapping_db = SymbolMappingDatabase()
-    if load_full_mapping:
-        full_mapping_path = Path(__file__).parent / "mapping_db" / "symbol_mapping_full.json"
-        if full_mapping_path.exists():
-            try:
-                mapping_db.load_full_mapping(str(full_mapping_path))
-            except Exception as e:
-                print(f"Warning: Could not load full mapping database: {e}")
+    mapping_db = _load_mapping_db(load_full_mapping)
     
     ranker = CandidateRanker(
         mapping_db=mapping_db,
@@ -8,12 +8,18 @@ ranked by mathematical priority.
 from .symbol_mapping import (
     SymbolMappingDatabase,
     SymbolMapping,
+    SymbolMappingTable,
     LaTeXCandidate,
+    CandidateArrays,
+    get_default_db,
 )
 
 __all__ = [
     "SymbolMappingDatabase",
     "SymbolMapping",
+    "SymbolMappingTable",
     "LaTeXCandidate",
+    "CandidateArrays",
+    "get_default_db",
 ]
 
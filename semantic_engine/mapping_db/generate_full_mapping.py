@@ -8,6 +8,7 @@ For other symbols, it creates basic mappings with the LaTeX command from the CSV
 
 import csv
 import json
+import re
 from pathlib import Path
 from typing import Dict, Set
 import sys
@@ -21,6 +22,18 @@ from semantic_engine.mapping_db.symbol_mapping import (
     LaTeXCandidate
 )
 
+try:
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+# Below this many new symbols, worker start-up costs more than it saves
+PARALLEL_MIN_SYMBOLS = 5000
+
+# Font-style wrappers removed when deriving a symbol name from a LaTeX command
+_MATH_FONT_RE = re.compile(r'math(?:cal|bb|frak|scr|ds)\{|\}')
+
 
 def load_symbols_csv(csv_path: str) -> Dict[int, str]:
     """
@@ -29,14 +42,12 @@ def load_symbols_csv(csv_path: str) -> Dict[int, str]:
     Returns:
         Dictionary mapping symbol_id -> latex_command
     """
-    symbols = {}
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            symbol_id = int(row['symbol_id'])
-            latex = row['latex']
-            symbols[symbol_id] = latex
-    return symbols
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        id_col = header.index('symbol_id')
+        latex_col = header.index('latex')
+        return {int(row[id_col]): row[latex_col] for row in reader}
 
 
 def generate_symbol_name(latex_command: str, symbol_id: int) -> str:
@@ -52,14 +63,8 @@ def generate_symbol_name(latex_command: str, symbol_id: int) -> str:
     """
     # Remove backslash if present
     if latex_command.startswith('\\'):
-        name = latex_command[1:]
-        # Replace common patterns
-        name = name.replace('mathcal{', '').replace('}', '')
-        name = name.replace('mathbb{', '').replace('}', '')
-        name = name.replace('mathfrak{', '').replace('}', '')
-        name = name.replace('mathscr{', '').replace('}', '')
-        name = name.replace('mathds{', '').replace('}', '')
-        return name
+        # Strip font commands (e.g. mathcal{) and closing braces in one pass
+        return _MATH_FONT_RE.sub('', latex_command[1:])
     else:
         # Single character or simple symbol
         return latex_command
@@ -82,6 +87,17 @@ def create_basic_mapping(symbol_id: int, latex_command: str) -> SymbolMapping:
     context = "mathematical symbol"
     if latex_command.startswith('\\'):
         context = f"LaTeX command: {latex_command}"
+    elif len(latex_command) == 1 and ord(latex_command) < 128:
+        # Single ASCII character (the common case): classify by code point
+        code = ord(latex_command)
+        if 65 <= code <= 90:  # A-Z
+            context = "capital letter"
+        elif 97 <= code <= 122:  # a-z
+            context = "lowercase letter"
+        elif 48 <= code <= 57:  # 0-9
+            context = "digit"
+        else:
+            context = "symbol"
     elif latex_command.isalpha():
         if latex_command.isupper():
             context = "capital letter"
@@ -92,6 +108,10 @@ def create_basic_mapping(symbol_id: int, latex_command: str) -> SymbolMapping:
     else:
         context = "symbol"
     
+    # Share one object per distinct string across the generated mappings
+    symbol_name = sys.intern(symbol_name)
+    context = sys.intern(context)
+    
     return SymbolMapping(
         symbol_class_id=symbol_id,
         symbol_name=symbol_name,
@@ -128,27 +148,41 @@ def generate_full_database(
     # Get IDs that already have detailed mappings
     existing_ids: Set[int] = set(existing_db.mappings.keys())
     
-    # Create new database starting with existing mappings
-    full_db = SymbolMappingDatabase()
-    full_db.mappings = existing_db.mappings.copy()
+    # Basic mappings for symbols not yet in the database. create_basic_mapping
+    # is pure, so large symbol sets are spread across cores when joblib is available.
+    missing = [
+        (symbol_id, latex_command)
+        for symbol_id, latex_command in all_symbols.items()
+        if symbol_id not in existing_ids
+    ]
+    if JOBLIB_AVAILABLE and len(missing) >= PARALLEL_MIN_SYMBOLS:
+        new_mappings = Parallel(n_jobs=-1, batch_size=256)(
+            delayed(create_basic_mapping)(symbol_id, latex_command)
+            for symbol_id, latex_command in missing
+        )
+    else:
+        new_mappings = [
+            create_basic_mapping(symbol_id, latex_command)
+            for symbol_id, latex_command in missing
+        ]
+    generated = {mapping.symbol_class_id: mapping for mapping in new_mappings}
+    missing_count = len(generated)
     
-    # Add mappings for symbols not yet in the database
-    missing_count = 0
-    for symbol_id, latex_command in all_symbols.items():
-        if symbol_id not in existing_ids:
-            # Create basic mapping
-            mapping = create_basic_mapping(symbol_id, latex_command)
-            full_db.mappings[symbol_id] = mapping
-            missing_count += 1
+    # Build the full table in one pass; existing mappings are kept as they are
+    full_db = SymbolMappingDatabase()
+    full_db.mappings = {**existing_db.mappings, **generated}
     
     print(f"Generated mappings for {missing_count} symbols")
     print(f"Total symbols in database: {len(full_db.mappings)}")
     print(f"Manually curated mappings: {len(existing_ids)}")
     print(f"Auto-generated mappings: {missing_count}")
     
-    # Save to file
+    # Save to file, plus the .npz snapshot used for fast startup
     full_db.save_to_file(output_path)
     print(f"\nComplete database saved to: {output_path}")
+    fast_path = str(Path(output_path).with_suffix(".npz"))
+    full_db.save_fast(fast_path)
+    print(f"Fast-load snapshot saved to: {fast_path}")
     
     return full_db
 
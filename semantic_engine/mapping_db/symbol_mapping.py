@@ -11,30 +11,334 @@ Mathematical Priority Principle:
 - This ensures the system suggests the most mathematically appropriate LaTeX command
 """
 
-from typing import List, Dict, Optional
+from typing import Dict, List, Iterator, Optional, Tuple
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
+import functools
 import json
+import operator
+import pickle
+import sys
+
+import numpy as np
+
+try:
+    from .symbol_mapping_data import RAW_MAPPINGS
+except ImportError:
+    # Imported as a top-level module (e.g. test_mapping.py run from this directory)
+    from symbol_mapping_data import RAW_MAPPINGS
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _pack_strings(strings: List[str]) -> np.ndarray:
+    """Pack strings into one NUL-separated UTF-8 byte array."""
+    return np.frombuffer("\0".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_strings(packed: np.ndarray) -> List[str]:
+    """Inverse of _pack_strings."""
+    return packed.tobytes().decode("utf-8").split("\0")
+
+
+# Sort key for ranking candidates by mathematical priority
+_PRIORITY_KEY = operator.attrgetter("math_priority")
+
+# Math priorities are authored in steps of 0.01, so they also fit losslessly
+# into a uint8 count of hundredths
+PRIORITY_QUANTUM = 100
+
+
+def _quantize_priorities(priorities: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Pack float32 priorities into uint8 hundredths.
+    
+    Returns None when any priority would not round-trip exactly, so the compact
+    form is never a lossy stand-in for the float32 column.
+    """
+    codes = np.rint(priorities * PRIORITY_QUANTUM)
+    if codes.size and (codes.min() < 0 or codes.max() > 255):
+        return None
+    codes = codes.astype(np.uint8)
+    if not np.array_equal(codes.astype(np.float32) / np.float32(PRIORITY_QUANTUM), priorities):
+        return None
+    return codes
 
 
-@dataclass
 class LaTeXCandidate:
-    """A single LaTeX command candidate for a symbol."""
-    command: str  # LaTeX command, e.g., "\\implies"
-    math_priority: float  # Mathematical priority score (0.0-1.0, higher = more mathematical)
-    context: str  # Brief context description, e.g., "logical implication"
-    description: Optional[str] = None  # Optional detailed description
+    """
+    A single LaTeX command candidate for a symbol.
+    
+    Hand-written slotted class rather than a dataclass: thousands are created
+    when mappings are loaded, and an ``__init__`` writing the slots directly is
+    faster than a frozen dataclass's. Instances are shared between databases
+    and hashable, so assigning attributes after construction raises
+    AttributeError.
+    """
+    
+    __slots__ = ("command", "math_priority", "context", "description")
+    
+    def __init__(
+        self,
+        command: str,
+        math_priority: float,
+        context: str,
+        description: Optional[str] = None
+    ):
+        # Write the slots through their descriptors, bypassing __setattr__
+        _set_command(self, command)  # LaTeX command, e.g., "\\implies"
+        _set_math_priority(self, math_priority)  # Mathematical priority score (0.0-1.0, higher = more mathematical)
+        _set_context(self, context)  # Brief context description, e.g., "logical implication"
+        _set_description(self, description)  # Optional detailed description
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field {name!r} of immutable LaTeXCandidate")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field {name!r} of immutable LaTeXCandidate")
+    
+    def _fields(self) -> Tuple[str, float, str, Optional[str]]:
+        return (self.command, self.math_priority, self.context, self.description)
+    
+    def __repr__(self) -> str:
+        return (
+            f"LaTeXCandidate(command={self.command!r}, math_priority={self.math_priority!r}, "
+            f"context={self.context!r}, description={self.description!r})"
+        )
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __hash__(self) -> int:
+        return hash(self._fields())
+    
+    def __reduce__(self):
+        return (self.__class__, self._fields())
+
+
+# Slot setters used by LaTeXCandidate.__init__; faster than object.__setattr__
+_set_command = LaTeXCandidate.command.__set__
+_set_math_priority = LaTeXCandidate.math_priority.__set__
+_set_context = LaTeXCandidate.context.__set__
+_set_description = LaTeXCandidate.description.__set__
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SymbolMapping:
     """Mapping from a visual symbol class to LaTeX candidates."""
     symbol_class_id: int  # ID from Vision Engine
     symbol_name: str  # Human-readable name, e.g., "double right arrow"
-    latex_candidates: List[LaTeXCandidate] = field(default_factory=list)
+    latex_candidates: Tuple[LaTeXCandidate, ...] = ()
+    _ranked: Tuple[LaTeXCandidate, ...] = field(init=False, repr=False, compare=False)
     
-    def get_ranked_candidates(self) -> List[LaTeXCandidate]:
+    def __post_init__(self):
+        # Freeze the candidates (lists are accepted for convenience) and rank them once
+        if not isinstance(self.latex_candidates, tuple):
+            object.__setattr__(self, "latex_candidates", tuple(self.latex_candidates))
+        object.__setattr__(
+            self,
+            "_ranked",
+            tuple(sorted(self.latex_candidates, key=_PRIORITY_KEY, reverse=True))
+        )
+    
+    def get_ranked_candidates(self) -> Tuple[LaTeXCandidate, ...]:
         """Return candidates sorted by mathematical priority (descending)."""
-        return sorted(self.latex_candidates, key=lambda x: x.math_priority, reverse=True)
+        return self._ranked
+
+
+@dataclass(frozen=True)
+class CandidateArrays:
+    """
+    Columnar (structure-of-arrays) view of all ranked candidates in a database.
+    
+    Candidates of symbol class ``i`` occupy the index range
+    ``offsets[i]:offsets[i + 1]`` of every column, in ranked order.
+    """
+    offsets: np.ndarray  # CSR row pointer (int32), one entry per class ID plus one
+    priorities: np.ndarray  # Math priority per candidate (float32)
+    priorities_u8: Optional[np.ndarray]  # Same priorities in hundredths (uint8), None if not exact
+    commands: List[str]  # LaTeX command per candidate
+    candidates: List[LaTeXCandidate]  # Source candidate objects, same order
+
+
+class SymbolMappingTable(MutableMapping):
+    """
+    Dict-compatible container of SymbolMappings keyed by symbol class ID.
+    
+    Class IDs are small non-negative integers, so mappings are stored in a dense
+    list indexed by ID instead of a hash table. Iteration yields IDs in ascending
+    order. ``version`` increases on every mutation so derived caches can detect
+    changes. After ``freeze()`` every mutation raises TypeError.
+    """
+    
+    read_only = False  # Class default, so tables pickled before freeze() existed still load
+    
+    def __init__(self, mappings=None):
+        self._slots: List[Optional[SymbolMapping]] = []
+        self._count = 0
+        self.version = 0
+        if mappings is not None:
+            mappings = dict(mappings)
+            if mappings:
+                # Allocate all slots up front instead of growing per insert
+                self._slots = [None] * (max(mappings) + 1)
+            self.update(mappings)
+    
+    def get(self, class_id, default=None):
+        try:
+            index = operator.index(class_id)
+        except TypeError:
+            return default
+        if 0 <= index < len(self._slots):
+            mapping = self._slots[index]
+            if mapping is not None:
+                return mapping
+        return default
+    
+    def __getitem__(self, class_id) -> SymbolMapping:
+        mapping = self.get(class_id)
+        if mapping is None:
+            raise KeyError(class_id)
+        return mapping
+    
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError(f"{type(self).__name__} is read-only; modify a copy() instead")
+    
+    def __setitem__(self, class_id, mapping: SymbolMapping):
+        self._check_writable()
+        index = operator.index(class_id)
+        if index < 0:
+            raise ValueError(f"Symbol class ID must be non-negative, got {class_id}")
+        if index >= len(self._slots):
+            self._slots.extend([None] * (index + 1 - len(self._slots)))
+        if self._slots[index] is None:
+            self._count += 1
+        self._slots[index] = mapping
+        self.version += 1
+    
+    def __delitem__(self, class_id):
+        self._check_writable()
+        self[class_id]  # Raises KeyError if absent
+        self._slots[operator.index(class_id)] = None
+        self._count -= 1
+        self.version += 1
+    
+    def __contains__(self, class_id) -> bool:
+        return self.get(class_id) is not None
+    
+    def __iter__(self) -> Iterator[int]:
+        return (class_id for class_id, mapping in enumerate(self._slots) if mapping is not None)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+    
+    def update_missing(self, other) -> int:
+        """
+        Add the mappings of ``other`` whose class IDs are not present yet.
+        
+        Existing entries take precedence. The slot lists are merged directly in
+        one pass and ``version`` is bumped once, instead of once per insert.
+        
+        Args:
+            other: SymbolMappingTable or mapping of class ID -> SymbolMapping
+        
+        Returns:
+            Number of mappings added
+        """
+        self._check_writable()
+        if not isinstance(other, SymbolMappingTable):
+            other = SymbolMappingTable(other)
+        other_slots = other._slots
+        if len(other_slots) > len(self._slots):
+            self._slots.extend([None] * (len(other_slots) - len(self._slots)))
+        slots = self._slots
+        added = 0
+        for class_id, mapping in enumerate(other_slots):
+            if mapping is not None and slots[class_id] is None:
+                slots[class_id] = mapping
+                added += 1
+        if added:
+            self._count += added
+            self.version += 1
+        return added
+    
+    def freeze(self) -> 'SymbolMappingTable':
+        """Make the table read-only in place and return it."""
+        self.read_only = True
+        return self
+    
+    def copy(self) -> 'SymbolMappingTable':
+        """Return a shallow, modifiable copy of the table."""
+        table = type(self)()
+        table._slots = self._slots.copy()
+        table._count = self._count
+        return table
+
+
+# Built once at import; every SymbolMappingDatabase starts from a copy of this table.
+# Commands and contexts are interned, as in from_json/load_fast, so entries loaded
+# from a full mapping file share the same string objects.
+_FROZEN_MAPPINGS = SymbolMappingTable({
+    class_id: SymbolMapping(
+        symbol_class_id=class_id,
+        symbol_name=symbol_name,
+        latex_candidates=tuple(
+            LaTeXCandidate(sys.intern(command), math_priority, sys.intern(context), description)
+            for command, math_priority, context, description in candidates
+        )
+    )
+    for class_id, symbol_name, candidates in RAW_MAPPINGS
+})
+
+
+def _mappings_to_json(mappings: SymbolMappingTable, pretty: bool = True) -> str:
+    """
+    Serialize a mapping table to the database's JSON format.
+    
+    Args:
+        mappings: Table to serialize
+        pretty: If True, indent by two spaces; otherwise emit compact JSON
+    """
+    data = {
+        class_id: {
+            "symbol_class_id": mapping.symbol_class_id,
+            "symbol_name": mapping.symbol_name,
+            "latex_candidates": [
+                {
+                    "command": cand.command,
+                    "math_priority": cand.math_priority,
+                    "context": cand.context,
+                    "description": cand.description
+                }
+                for cand in mapping.latex_candidates
+            ]
+        }
+        for class_id, mapping in mappings.items()
+    }
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option).decode("utf-8")
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=2)
+def _frozen_mappings_json(pretty: bool = True) -> str:
+    """JSON of the built-in mappings, serialized on first use and then reused."""
+    return _mappings_to_json(_FROZEN_MAPPINGS, pretty)
 
 
 class SymbolMappingDatabase:
@@ -50,494 +354,175 @@ class SymbolMappingDatabase:
        Example: \\in (set membership) > general epsilon, \\forall (quantifier) > general A
     """
     
+    _read_only = False  # Set by freeze()
+    
     def __init__(self):
-        self.mappings: Dict[int, SymbolMapping] = {}
+        self.mappings = SymbolMappingTable()
         self._initialize_mappings()
     
+    @property
+    def mappings(self) -> SymbolMappingTable:
+        """Symbol class ID -> SymbolMapping table."""
+        return self._mappings
+    
+    @mappings.setter
+    def mappings(self, mappings):
+        if self._read_only:
+            raise TypeError("SymbolMappingDatabase is read-only; modify a copy() instead")
+        if not isinstance(mappings, SymbolMappingTable):
+            mappings = SymbolMappingTable(mappings)
+        self._mappings = mappings
+        self._candidate_arrays: Optional[CandidateArrays] = None
+        self._candidate_arrays_version = -1
+        self._json_cache: Dict[bool, str] = {}
+        self._json_cache_version = -1
+        # Table version at which the mappings still equal the built-in defaults
+        self._defaults_version = -1
+    
     def _initialize_mappings(self):
         """Initialize the mapping database with common mathematical symbols."""
+        # Copy of the table built once at import; the mappings themselves are shared
+        self.mappings = _FROZEN_MAPPINGS.copy()
+        self._defaults_version = self.mappings.version
+    
+    def freeze(self) -> 'SymbolMappingDatabase':
+        """
+        Make the database read-only in place and return it.
         
-        # ===== Logical Implication / Arrow Symbols =====
-        # Double right arrow (implies)
-        self.mappings[1] = SymbolMapping(
-            symbol_class_id=1,
-            symbol_name="double right arrow",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\implies",
-                    math_priority=1.0,  # Highest: specific logical meaning
-                    context="logical implication",
-                    description="Standard symbol for logical implication in mathematical logic"
-                ),
-                LaTeXCandidate(
-                    command="\\Rightarrow",
-                    math_priority=0.6,  # Medium: general mathematical arrow
-                    context="general implication",
-                    description="General double-line right arrow, less specific than \\implies"
-                ),
-                LaTeXCandidate(
-                    command="\\rightarrow",
-                    math_priority=0.3,  # Lower: generic arrow
-                    context="generic arrow or mapping",
-                    description="Generic right arrow, can mean function mapping or general direction"
-                ),
-            ]
-        )
-        
-        # Double left-right arrow (iff)
-        self.mappings[2] = SymbolMapping(
-            symbol_class_id=2,
-            symbol_name="double left-right arrow",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\iff",
-                    math_priority=1.0,
-                    context="if and only if",
-                    description="Standard symbol for logical equivalence (if and only if)"
-                ),
-                LaTeXCandidate(
-                    command="\\Leftrightarrow",
-                    math_priority=0.6,
-                    context="general equivalence",
-                    description="General double-line bidirectional arrow"
-                ),
-                LaTeXCandidate(
-                    command="\\leftrightarrow",
-                    math_priority=0.3,
-                    context="generic bidirectional arrow",
-                    description="Generic bidirectional arrow"
-                ),
-            ]
-        )
-        
-        # Single right arrow
-        self.mappings[3] = SymbolMapping(
-            symbol_class_id=3,
-            symbol_name="right arrow",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\rightarrow",
-                    math_priority=0.8,
-                    context="function mapping or limit",
-                    description="Commonly used for function mappings f: A → B or limits"
-                ),
-                LaTeXCandidate(
-                    command="\\to",
-                    math_priority=0.7,
-                    context="function mapping (shorthand)",
-                    description="Shorthand for \\rightarrow, commonly used in function notation"
-                ),
-                LaTeXCandidate(
-                    command="\\mapsto",
-                    math_priority=0.9,
-                    context="element mapping",
-                    description="Maps to (element-wise), e.g., x ↦ f(x)"
-                ),
-            ]
-        )
-        
-        # ===== Set Theory Symbols =====
-        # Subset or equal
-        self.mappings[4] = SymbolMapping(
-            symbol_class_id=4,
-            symbol_name="subset or equal",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\subseteq",
-                    math_priority=1.0,
-                    context="subset or equal",
-                    description="Standard symbol for subset or equal in set theory"
-                ),
-                LaTeXCandidate(
-                    command="\\subset",
-                    math_priority=0.7,
-                    context="proper subset",
-                    description="Proper subset (not equal)"
-                ),
-                LaTeXCandidate(
-                    command="\\subseteqq",
-                    math_priority=0.9,
-                    context="subset or equal (variant)",
-                    description="Variant of \\subseteq, less common"
-                ),
-            ]
-        )
-        
-        # Element of
-        self.mappings[5] = SymbolMapping(
-            symbol_class_id=5,
-            symbol_name="element of",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\in",
-                    math_priority=1.0,
-                    context="set membership",
-                    description="Standard symbol for set membership (element of)"
-                ),
-                LaTeXCandidate(
-                    command="\\epsilon",
-                    math_priority=0.2,
-                    context="Greek letter epsilon",
-                    description="Greek letter epsilon, visually similar but different meaning"
-                ),
-            ]
-        )
-        
-        # Union
-        self.mappings[6] = SymbolMapping(
-            symbol_class_id=6,
-            symbol_name="union",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\cup",
-                    math_priority=1.0,
-                    context="set union",
-                    description="Standard symbol for set union"
-                ),
-                LaTeXCandidate(
-                    command="\\bigcup",
-                    math_priority=0.9,
-                    context="big union",
-                    description="Large union operator for indexed unions"
-                ),
-            ]
-        )
-        
-        # Intersection
-        self.mappings[7] = SymbolMapping(
-            symbol_class_id=7,
-            symbol_name="intersection",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\cap",
-                    math_priority=1.0,
-                    context="set intersection",
-                    description="Standard symbol for set intersection"
-                ),
-                LaTeXCandidate(
-                    command="\\bigcap",
-                    math_priority=0.9,
-                    context="big intersection",
-                    description="Large intersection operator for indexed intersections"
-                ),
-            ]
-        )
-        
-        # ===== Comparison Symbols =====
-        # Less than or equal
-        self.mappings[8] = SymbolMapping(
-            symbol_class_id=8,
-            symbol_name="less than or equal",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\leq",
-                    math_priority=1.0,
-                    context="less than or equal",
-                    description="Standard mathematical symbol for less than or equal"
-                ),
-                LaTeXCandidate(
-                    command="\\leqslant",
-                    math_priority=0.8,
-                    context="less than or equal (variant)",
-                    description="Variant of \\leq, less common"
-                ),
-            ]
-        )
-        
-        # Greater than or equal
-        self.mappings[9] = SymbolMapping(
-            symbol_class_id=9,
-            symbol_name="greater than or equal",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\geq",
-                    math_priority=1.0,
-                    context="greater than or equal",
-                    description="Standard mathematical symbol for greater than or equal"
-                ),
-                LaTeXCandidate(
-                    command="\\geqslant",
-                    math_priority=0.8,
-                    context="greater than or equal (variant)",
-                    description="Variant of \\geq, less common"
-                ),
-            ]
-        )
-        
-        # Not equal
-        self.mappings[10] = SymbolMapping(
-            symbol_class_id=10,
-            symbol_name="not equal",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\neq",
-                    math_priority=1.0,
-                    context="not equal",
-                    description="Standard mathematical symbol for not equal"
-                ),
-                LaTeXCandidate(
-                    command="\\ne",
-                    math_priority=0.9,
-                    context="not equal (shorthand)",
-                    description="Shorthand for \\neq"
-                ),
-            ]
-        )
-        
-        # Approximately equal
-        self.mappings[11] = SymbolMapping(
-            symbol_class_id=11,
-            symbol_name="approximately equal",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\approx",
-                    math_priority=1.0,
-                    context="approximately equal",
-                    description="Standard symbol for approximately equal"
-                ),
-                LaTeXCandidate(
-                    command="\\simeq",
-                    math_priority=0.8,
-                    context="asymptotically equal",
-                    description="Asymptotically equal, used in asymptotic analysis"
-                ),
-                LaTeXCandidate(
-                    command="\\cong",
-                    math_priority=0.7,
-                    context="congruent",
-                    description="Congruent, used in geometry"
-                ),
-            ]
-        )
-        
-        # ===== Logical Quantifiers =====
-        # For all
-        self.mappings[12] = SymbolMapping(
-            symbol_class_id=12,
-            symbol_name="for all",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\forall",
-                    math_priority=1.0,
-                    context="universal quantifier",
-                    description="Universal quantifier (for all) in mathematical logic"
-                ),
-            ]
-        )
-        
-        # Exists
-        self.mappings[13] = SymbolMapping(
-            symbol_class_id=13,
-            symbol_name="exists",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\exists",
-                    math_priority=1.0,
-                    context="existential quantifier",
-                    description="Existential quantifier (there exists) in mathematical logic"
-                ),
-            ]
-        )
-        
-        # ===== Operators =====
-        # Multiplication
-        self.mappings[14] = SymbolMapping(
-            symbol_class_id=14,
-            symbol_name="multiplication",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\times",
-                    math_priority=1.0,
-                    context="multiplication or cross product",
-                    description="Standard symbol for multiplication or cross product"
-                ),
-                LaTeXCandidate(
-                    command="\\cdot",
-                    math_priority=0.9,
-                    context="dot product or scalar multiplication",
-                    description="Dot product or scalar multiplication"
-                ),
-                LaTeXCandidate(
-                    command="\\ast",
-                    math_priority=0.5,
-                    context="asterisk multiplication",
-                    description="Asterisk multiplication, less common"
-                ),
-            ]
-        )
-        
-        # Division
-        self.mappings[15] = SymbolMapping(
-            symbol_class_id=15,
-            symbol_name="division",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\div",
-                    math_priority=1.0,
-                    context="division",
-                    description="Standard symbol for division"
-                ),
-            ]
-        )
-        
-        # Plus minus
-        self.mappings[16] = SymbolMapping(
-            symbol_class_id=16,
-            symbol_name="plus minus",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\pm",
-                    math_priority=1.0,
-                    context="plus or minus",
-                    description="Standard symbol for plus or minus"
-                ),
-                LaTeXCandidate(
-                    command="\\mp",
-                    math_priority=0.9,
-                    context="minus or plus",
-                    description="Minus or plus (opposite of \\pm)"
-                ),
-            ]
-        )
-        
-        # ===== Equivalence =====
-        # Equivalent
-        self.mappings[17] = SymbolMapping(
-            symbol_class_id=17,
-            symbol_name="equivalent",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\equiv",
-                    math_priority=1.0,
-                    context="equivalent or congruent",
-                    description="Standard symbol for equivalence or congruence"
-                ),
-                LaTeXCandidate(
-                    command="\\sim",
-                    math_priority=0.7,
-                    context="similar or asymptotically equivalent",
-                    description="Similar or asymptotically equivalent"
-                ),
-            ]
-        )
-        
-        # ===== Integral =====
-        # Integral
-        self.mappings[18] = SymbolMapping(
-            symbol_class_id=18,
-            symbol_name="integral",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\int",
-                    math_priority=1.0,
-                    context="integral",
-                    description="Standard symbol for integral"
-                ),
-                LaTeXCandidate(
-                    command="\\oint",
-                    math_priority=0.9,
-                    context="contour integral",
-                    description="Contour integral (closed path integral)"
-                ),
-                LaTeXCandidate(
-                    command="\\iint",
-                    math_priority=0.8,
-                    context="double integral",
-                    description="Double integral"
-                ),
-            ]
-        )
-        
-        # ===== Summation =====
-        # Sum
-        self.mappings[19] = SymbolMapping(
-            symbol_class_id=19,
-            symbol_name="sum",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\sum",
-                    math_priority=1.0,
-                    context="summation",
-                    description="Standard symbol for summation"
-                ),
-                LaTeXCandidate(
-                    command="\\Sigma",
-                    math_priority=0.3,
-                    context="Greek letter capital sigma",
-                    description="Greek letter capital sigma, visually similar but different from \\sum"
-                ),
-            ]
-        )
-        
-        # ===== Product =====
-        # Product
-        self.mappings[20] = SymbolMapping(
-            symbol_class_id=20,
-            symbol_name="product",
-            latex_candidates=[
-                LaTeXCandidate(
-                    command="\\prod",
-                    math_priority=1.0,
-                    context="product",
-                    description="Standard symbol for product"
-                ),
-                LaTeXCandidate(
-                    command="\\Pi",
-                    math_priority=0.3,
-                    context="Greek letter capital pi",
-                    description="Greek letter capital pi, visually similar but different from \\prod"
-                ),
-            ]
-        )
+        Adding, replacing or merging mappings afterwards raises TypeError, so an
+        instance shared between callers cannot be changed under them.
+        """
+        self._mappings.freeze()
+        self._read_only = True
+        return self
+    
+    def copy(self) -> 'SymbolMappingDatabase':
+        """Return a modifiable copy sharing the (immutable) mapping objects."""
+        db = type(self)()
+        is_default = self._defaults_version == self.mappings.version
+        db.mappings = self.mappings.copy()
+        if is_default:
+            db._defaults_version = db.mappings.version
+        return db
     
     def get_mapping(self, symbol_class_id: int) -> Optional[SymbolMapping]:
         """Get the mapping for a given symbol class ID."""
         return self.mappings.get(symbol_class_id)
     
-    def get_ranked_candidates(self, symbol_class_id: int) -> List[LaTeXCandidate]:
+    def get_ranked_candidates(self, symbol_class_id: int) -> Tuple[LaTeXCandidate, ...]:
         """Get ranked LaTeX candidates for a symbol class, sorted by mathematical priority."""
         mapping = self.get_mapping(symbol_class_id)
         if mapping is None:
-            return []
+            return ()
         return mapping.get_ranked_candidates()
     
-    def to_json(self) -> str:
-        """Export the database to JSON format."""
-        data = {}
-        for class_id, mapping in self.mappings.items():
-            data[class_id] = {
-                "symbol_class_id": mapping.symbol_class_id,
-                "symbol_name": mapping.symbol_name,
-                "latex_candidates": [
-                    {
-                        "command": cand.command,
-                        "math_priority": cand.math_priority,
-                        "context": cand.context,
-                        "description": cand.description
-                    }
-                    for cand in mapping.latex_candidates
-                ]
-            }
-        return json.dumps(data, indent=2, ensure_ascii=False)
+    def get_candidate_arrays(self) -> CandidateArrays:
+        """
+        Get all ranked candidates in columnar form for vectorized scoring.
+        
+        The arrays are built on first use and cached until the mappings change.
+        The SymbolMapping/LaTeXCandidate objects remain the source of truth.
+        """
+        if self._candidate_arrays_version != self.mappings.version:
+            num_slots = max(self.mappings, default=-1) + 1
+            counts = np.zeros(num_slots, dtype=np.int32)
+            for class_id, mapping in self.mappings.items():
+                counts[class_id] = len(mapping.latex_candidates)
+            
+            offsets = np.zeros(num_slots + 1, dtype=np.int32)
+            np.cumsum(counts, out=offsets[1:])
+            
+            candidates: List[LaTeXCandidate] = [None] * int(offsets[-1])
+            for class_id, mapping in self.mappings.items():
+                candidates[offsets[class_id]:offsets[class_id + 1]] = mapping.get_ranked_candidates()
+            
+            priorities = np.array([c.math_priority for c in candidates], dtype=np.float32)
+            self._candidate_arrays = CandidateArrays(
+                offsets=offsets,
+                priorities=priorities,
+                priorities_u8=_quantize_priorities(priorities),
+                commands=[c.command for c in candidates],
+                candidates=candidates
+            )
+            self._candidate_arrays_version = self.mappings.version
+        return self._candidate_arrays
+    
+    def ranked_view(self, symbol_class_id: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Get the ranked candidates of one symbol class as columnar slices.
+        
+        Args:
+            symbol_class_id: Symbol class ID
+        
+        Returns:
+            Tuple of (LaTeX commands, float32 math priorities) in ranked order;
+            both are empty for unknown class IDs. The priorities are a read-only
+            view into the shared candidate arrays.
+        """
+        arrays = self.get_candidate_arrays()
+        if not 0 <= symbol_class_id < len(arrays.offsets) - 1:
+            return [], np.empty(0, dtype=np.float32)
+        start = int(arrays.offsets[symbol_class_id])
+        end = int(arrays.offsets[symbol_class_id + 1])
+        priorities = arrays.priorities[start:end]
+        priorities.flags.writeable = False
+        return arrays.commands[start:end], priorities
+    
+    def priorities_view(self, symbol_class_id: int) -> np.ndarray:
+        """
+        Get the float32 math priorities of one symbol class in ranked order.
+        
+        Returns a contiguous, read-only view (empty for unknown class IDs) so a
+        caller can score a class with e.g. ``confidence * priorities``.
+        """
+        return self.ranked_view(symbol_class_id)[1]
+    
+    def to_json(self, pretty: bool = True) -> str:
+        """
+        Export the database to JSON format.
+        
+        The result is cached until the mappings change; an unmodified default
+        database reuses JSON serialized once for all instances.
+        
+        Args:
+            pretty: If True (default), indent by two spaces; otherwise emit
+                    compact JSON for machine consumption
+        """
+        version = self.mappings.version
+        if self._json_cache_version != version:
+            self._json_cache = {}
+            self._json_cache_version = version
+        json_str = self._json_cache.get(pretty)
+        if json_str is None:
+            if version == self._defaults_version:
+                json_str = _frozen_mappings_json(pretty)
+            else:
+                json_str = _mappings_to_json(self.mappings, pretty)
+            self._json_cache[pretty] = json_str
+        return json_str
     
     def save_to_file(self, filepath: str):
         """Save the database to a JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(self.to_json())
+        # Encode once and write the bytes directly, bypassing the text layer
+        payload = self.to_json().encode('utf-8')
+        with open(filepath, 'wb') as f:
+            f.write(payload)
     
     @classmethod
     def from_json(cls, json_str: str) -> 'SymbolMappingDatabase':
         """Load the database from JSON format."""
         data = json.loads(json_str)
         db = cls()
-        db.mappings = {}
+        db.mappings = SymbolMappingTable()
         for class_id_str, mapping_data in data.items():
             class_id = int(class_id_str)
+            # Contexts repeat across hundreds of candidates ("capital letter",
+            # "digit", ...), so intern them to share one string object each
             candidates = [
                 LaTeXCandidate(
-                    command=cand["command"],
+                    command=sys.intern(cand["command"]),
                     math_priority=cand["math_priority"],
-                    context=cand["context"],
+                    context=sys.intern(cand["context"]),
                     description=cand.get("description")
                 )
                 for cand in mapping_data["latex_candidates"]
@@ -556,18 +541,113 @@ class SymbolMappingDatabase:
             json_str = f.read()
         return cls.from_json(json_str)
     
+    def save_fast(self, filepath: str):
+        """
+        Save the database as a NumPy .npz archive of flat columns.
+        
+        Loading this format skips JSON parsing; use JSON for interchange and this
+        for the application's startup path.
+        """
+        mappings = list(self.mappings.values())
+        candidates = [cand for mapping in mappings for cand in mapping.latex_candidates]
+        cand_offsets = np.zeros(len(mappings) + 1, dtype=np.int32)
+        np.cumsum([len(mapping.latex_candidates) for mapping in mappings], out=cand_offsets[1:])
+        
+        np.savez(
+            filepath,
+            symbol_ids=np.array(list(self.mappings.keys()), dtype=np.int32),
+            symbol_names=_pack_strings([mapping.symbol_name for mapping in mappings]),
+            cand_offsets=cand_offsets,
+            priorities=np.array([cand.math_priority for cand in candidates], dtype=np.float64),
+            commands=_pack_strings([cand.command for cand in candidates]),
+            contexts=_pack_strings([cand.context for cand in candidates]),
+            descriptions=_pack_strings([cand.description or "" for cand in candidates]),
+            has_description=np.array([cand.description is not None for cand in candidates], dtype=bool)
+        )
+    
+    @classmethod
+    def load_fast(cls, filepath: str) -> 'SymbolMappingDatabase':
+        """Load the database from an .npz archive written by save_fast()."""
+        with np.load(filepath, allow_pickle=False) as data:
+            symbol_ids = data["symbol_ids"].tolist()
+            symbol_names = _unpack_strings(data["symbol_names"])
+            cand_offsets = data["cand_offsets"].tolist()
+            candidates = [
+                LaTeXCandidate(
+                    command=sys.intern(command),
+                    math_priority=priority,
+                    context=sys.intern(context),
+                    description=description if has_description else None
+                )
+                for command, priority, context, description, has_description in zip(
+                    _unpack_strings(data["commands"]),
+                    data["priorities"].tolist(),
+                    _unpack_strings(data["contexts"]),
+                    _unpack_strings(data["descriptions"]),
+                    data["has_description"].tolist()
+                )
+            ]
+        
+        db = cls()
+        db.mappings = SymbolMappingTable()
+        for i, (class_id, symbol_name) in enumerate(zip(symbol_ids, symbol_names)):
+            db.mappings[class_id] = SymbolMapping(
+                symbol_class_id=class_id,
+                symbol_name=symbol_name,
+                latex_candidates=candidates[cand_offsets[i]:cand_offsets[i + 1]]
+            )
+        return db
+    
+    def save_binary(self, filepath: str):
+        """
+        Save the mapping table as a pickle (protocol 5).
+        
+        Intended for local caches written and read by the same installation;
+        pickles are Python-version specific and must only be loaded from trusted
+        sources. Use JSON for interchange.
+        """
+        with open(filepath, 'wb') as f:
+            pickle.dump(self.mappings, f, protocol=5)
+    
+    @classmethod
+    def load_binary(cls, filepath: str) -> 'SymbolMappingDatabase':
+        """Load the database from a pickle written by save_binary()."""
+        with open(filepath, 'rb') as f:
+            mappings = pickle.load(f)
+        if mappings.read_only:
+            # Saved from a frozen database; loaded databases are modifiable
+            mappings = mappings.copy()
+        db = cls()
+        db.mappings = mappings
+        return db
+    
     def load_full_mapping(self, filepath: str):
         """
-        Load full mapping database from JSON file and merge with existing mappings.
+        Load full mapping database from a JSON (or save_fast .npz, or
+        save_binary .pkl) file and merge with existing mappings.
         This preserves manually curated mappings while adding auto-generated ones.
         """
-        full_db = self.from_json_file(filepath)
-        # Merge: existing mappings take precedence
-        for class_id, mapping in full_db.mappings.items():
-            if class_id not in self.mappings:
-                # Only add if not already present (preserve manual mappings)
-                self.mappings[class_id] = mapping
+        if str(filepath).endswith(".npz"):
+            full_db = self.load_fast(filepath)
+        elif str(filepath).endswith(".pkl"):
+            full_db = self.load_binary(filepath)
+        else:
+            full_db = self.from_json_file(filepath)
+        # Merge: existing mappings take precedence (preserve manual mappings)
+        self.mappings.update_missing(full_db.mappings)
+
+
 
+@functools.lru_cache(maxsize=1)
+def get_default_db() -> SymbolMappingDatabase:
+    """
+    Get the process-wide database of built-in mappings.
+    
+    The instance is created on first use, shared by every caller and frozen:
+    mutating it raises TypeError. Use ``get_default_db().copy()`` or construct
+    SymbolMappingDatabase() directly for a private, modifiable database.
+    """
+    return SymbolMappingDatabase().freeze()
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""
+Curated symbol-to-LaTeX mapping data.
+
+Plain literal data, kept separate from the SymbolMappingDatabase logic. The table
+consists of constants only, so CPython folds it into a single constant that is
+loaded straight from the cached .pyc (marshal) instead of being rebuilt by
+bytecode on import.
+
+Candidate priorities follow the guidelines documented on SymbolMappingDatabase.
+"""
+
+# Built-in mappings for common mathematical symbols, as
+# (symbol_class_id, symbol_name, ((command, math_priority, context, description), ...))
+RAW_MAPPINGS = (
+    # ===== Logical Implication / Arrow Symbols =====
+    # Double right arrow (implies)
+    (1, "double right arrow", (
+        # Highest: specific logical meaning
+        ("\\implies", 1.0, "logical implication",
+         "Standard symbol for logical implication in mathematical logic"),
+        # Medium: general mathematical arrow
+        ("\\Rightarrow", 0.6, "general implication",
+         "General double-line right arrow, less specific than \\implies"),
+        # Lower: generic arrow
+        ("\\rightarrow", 0.3, "generic arrow or mapping",
+         "Generic right arrow, can mean function mapping or general direction"),
+    )),
+
+    # Double left-right arrow (iff)
+    (2, "double left-right arrow", (
+        ("\\iff", 1.0, "if and only if",
+         "Standard symbol for logical equivalence (if and only if)"),
+        ("\\Leftrightarrow", 0.6, "general equivalence",
+         "General double-line bidirectional arrow"),
+        ("\\leftrightarrow", 0.3, "generic bidirectional arrow",
+         "Generic bidirectional arrow"),
+    )),
+
+    # Single right arrow
+    (3, "right arrow", (
+        ("\\rightarrow", 0.8, "function mapping or limit",
+         "Commonly used for function mappings f: A → B or limits"),
+        ("\\to", 0.7, "function mapping (shorthand)",
+         "Shorthand for \\rightarrow, commonly used in function notation"),
+        ("\\mapsto", 0.9, "element mapping",
+         "Maps to (element-wise), e.g., x ↦ f(x)"),
+    )),
+
+    # ===== Set Theory Symbols =====
+    # Subset or equal
+    (4, "subset or equal", (
+        ("\\subseteq", 1.0, "subset or equal",
+         "Standard symbol for subset or equal in set theory"),
+        ("\\subset", 0.7, "proper subset",
+         "Proper subset (not equal)"),
+        ("\\subseteqq", 0.9, "subset or equal (variant)",
+         "Variant of \\subseteq, less common"),
+    )),
+
+    # Element of
+    (5, "element of", (
+        ("\\in", 1.0, "set membership",
+         "Standard symbol for set membership (element of)"),
+        ("\\epsilon", 0.2, "Greek letter epsilon",
+         "Greek letter epsilon, visually similar but different meaning"),
+    )),
+
+    # Union
+    (6, "union", (
+        ("\\cup", 1.0, "set union",
+         "Standard symbol for set union"),
+        ("\\bigcup", 0.9, "big union",
+         "Large union operator for indexed unions"),
+    )),
+
+    # Intersection
+    (7, "intersection", (
+        ("\\cap", 1.0, "set intersection",
+         "Standard symbol for set intersection"),
+        ("\\bigcap", 0.9, "big intersection",
+         "Large intersection operator for indexed intersections"),
+    )),
+
+    # ===== Comparison Symbols =====
+    # Less than or equal
+    (8, "less than or equal", (
+        ("\\leq", 1.0, "less than or equal",
+         "Standard mathematical symbol for less than or equal"),
+        ("\\leqslant", 0.8, "less than or equal (variant)",
+         "Variant of \\leq, less common"),
+    )),
+
+    # Greater than or equal
+    (9, "greater than or equal", (
+        ("\\geq", 1.0, "greater than or equal",
+         "Standard mathematical symbol for greater than or equal"),
+        ("\\geqslant", 0.8, "greater than or equal (variant)",
+         "Variant of \\geq, less common"),
+    )),
+
+    # Not equal
+    (10, "not equal", (
+        ("\\neq", 1.0, "not equal",
+         "Standard mathematical symbol for not equal"),
+        ("\\ne", 0.9, "not equal (shorthand)",
+         "Shorthand for \\neq"),
+    )),
+
+    # Approximately equal
+    (11, "approximately equal", (
+        ("\\approx", 1.0, "approximately equal",
+         "Standard symbol for approximately equal"),
+        ("\\simeq", 0.8, "asymptotically equal",
+         "Asymptotically equal, used in asymptotic analysis"),
+        ("\\cong", 0.7, "congruent",
+         "Congruent, used in geometry"),
+    )),
+
+    # ===== Logical Quantifiers =====
+    # For all
+    (12, "for all", (
+        ("\\forall", 1.0, "universal quantifier",
+         "Universal quantifier (for all) in mathematical logic"),
+    )),
+
+    # Exists
+    (13, "exists", (
+        ("\\exists", 1.0, "existential quantifier",
+         "Existential quantifier (there exists) in mathematical logic"),
+    )),
+
+    # ===== Operators =====
+    # Multiplication
+    (14, "multiplication", (
+        ("\\times", 1.0, "multiplication or cross product",
+         "Standard symbol for multiplication or cross product"),
+        ("\\cdot", 0.9, "dot product or scalar multiplication",
+         "Dot product or scalar multiplication"),
+        ("\\ast", 0.5, "asterisk multiplication",
+         "Asterisk multiplication, less common"),
+    )),
+
+    # Division
+    (15, "division", (
+        ("\\div", 1.0, "division",
+         "Standard symbol for division"),
+    )),
+
+    # Plus minus
+    (16, "plus minus", (
+        ("\\pm", 1.0, "plus or minus",
+         "Standard symbol for plus or minus"),
+        ("\\mp", 0.9, "minus or plus",
+         "Minus or plus (opposite of \\pm)"),
+    )),
+
+    # ===== Equivalence =====
+    # Equivalent
+    (17, "equivalent", (
+        ("\\equiv", 1.0, "equivalent or congruent",
+         "Standard symbol for equivalence or congruence"),
+        ("\\sim", 0.7, "similar or asymptotically equivalent",
+         "Similar or asymptotically equivalent"),
+    )),
+
+    # ===== Integral =====
+    # Integral
+    (18, "integral", (
+        ("\\int", 1.0, "integral",
+         "Standard symbol for integral"),
+        ("\\oint", 0.9, "contour integral",
+         "Contour integral (closed path integral)"),
+        ("\\iint", 0.8, "double integral",
+         "Double integral"),
+    )),
+
+    # ===== Summation =====
+    # Sum
+    (19, "sum", (
+        ("\\sum", 1.0, "summation",
+         "Standard symbol for summation"),
+        ("\\Sigma", 0.3, "Greek letter capital sigma",
+         "Greek letter capital sigma, visually similar but different from \\sum"),
+    )),
+
+    # ===== Product =====
+    # Product
+    (20, "product", (
+        ("\\prod", 1.0, "product",
+         "Standard symbol for product"),
+        ("\\Pi", 0.3, "Greek letter capital pi",
+         "Greek letter capital pi, visually similar but different from \\prod"),
+    )),
+)
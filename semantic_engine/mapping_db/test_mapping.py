@@ -4,12 +4,12 @@ Test script for the LaTeX candidate mapping database.
 This demonstrates how the mapping database works with mathematical priority ranking.
 """
 
-from symbol_mapping import SymbolMappingDatabase
+from symbol_mapping import get_default_db
 
 
 def test_mathematical_priority():
     """Test that mathematical priority ranking works correctly."""
-    db = SymbolMappingDatabase()
+    db = get_default_db()
     
     print("=" * 70)
     print("Testing Mathematical Priority Ranking")
@@ -44,7 +44,7 @@ def test_mathematical_priority():
 
 def test_priority_comparison():
     """Compare priorities for similar symbols to verify mathematical priority principle."""
-    db = SymbolMappingDatabase()
+    db = get_default_db()
     
     print("\n" + "=" * 70)
     print("Priority Comparison: Mathematical vs Generic")
@@ -89,7 +89,7 @@ def test_priority_comparison():
 
 def demonstrate_usage():
     """Demonstrate how to use the database in a real scenario."""
-    db = SymbolMappingDatabase()
+    db = get_default_db()
     
     print("\n" + "=" * 70)
     print("Usage Example: Vision Engine Output → LaTeX Suggestions")
@@ -0,0 +1,166 @@
+"""
+Numerical kernels for candidate ranking.
+
+The scoring and top-k selection loops are compiled with Numba when it is
+installed. Without Numba, the same computations run as NumPy operations.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def score_candidates(
+        vision_conf,
+        cand_symbol_idx,
+        cand_math_term,
+        vision_weight,
+        out
+    ):
+        """
+        Compute combined scores for a flat list of candidates.
+
+        Args:
+            vision_conf: Vision confidence per selected symbol
+            cand_symbol_idx: Index into vision_conf for each candidate
+            cand_math_term: Precomputed math_weight * math_priority per candidate
+            vision_weight: Weight for vision confidence
+            out: Output array receiving one score per candidate
+        """
+        for i in range(cand_symbol_idx.shape[0]):
+            out[i] = vision_conf[cand_symbol_idx[i]] * vision_weight + cand_math_term[i]
+
+    @njit(cache=True)
+    def rank_topk(scores, row_ends, k, out_positions, out_counts):
+        """
+        Select the top-k candidate positions of every row in a single pass.
+
+        Rows are contiguous ranges of scores ending at row_ends. Each row's best
+        positions are kept in a small insertion-sorted buffer, so no row is ever
+        fully sorted. Ties keep their original order.
+
+        Args:
+            scores: Combined score per candidate
+            row_ends: Exclusive end position of each row in scores
+            k: Maximum number of positions to select per row
+            out_positions: Output array of shape (num_rows, k) receiving positions
+                           in descending score order
+            out_counts: Output array receiving the number of positions per row
+        """
+        row_start = 0
+        for r in range(row_ends.shape[0]):
+            row_end = row_ends[r]
+            count = 0
+            if k > 0:
+                for p in range(row_start, row_end):
+                    score = scores[p]
+                    if count == k and not score > scores[out_positions[r, k - 1]]:
+                        continue
+                    # Shift lower-scoring entries down; equal ones stay ahead
+                    j = count if count < k else k - 1
+                    while j > 0 and score > scores[out_positions[r, j - 1]]:
+                        out_positions[r, j] = out_positions[r, j - 1]
+                        j -= 1
+                    out_positions[r, j] = p
+                    if count < k:
+                        count += 1
+            out_counts[r] = count
+            row_start = row_end
+
+    @njit(cache=True)
+    def normalize_predictions(x):
+        """
+        Return x unchanged if it already looks like probabilities, else its softmax.
+
+        The range check (min < 0 or max > 1) and the softmax are fused, so the
+        vector is scanned once for the check and twice more only for logits.
+        Compiled without fastmath so NaNs behave as in the NumPy fallback: NaN
+        min/max fail both comparisons and x is returned unchanged.
+
+        Args:
+            x: 1-D float32 or float64 prediction vector
+
+        Returns:
+            x itself, or a new array of the same dtype holding softmax(x)
+        """
+        mn = x[0]
+        mx = x[0]
+        for i in range(x.shape[0]):
+            v = x[i]
+            if math.isnan(v):
+                return x
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+        if mn >= 0.0 and mx <= 1.0:
+            return x
+        out = np.empty_like(x)
+        total = 0.0
+        for i in range(x.shape[0]):
+            e = math.exp(x[i] - mx)
+            out[i] = e
+            total += e
+        inv = 1.0 / total
+        for i in range(x.shape[0]):
+            out[i] *= inv
+        return out
+else:
+    def score_candidates(
+        vision_conf,
+        cand_symbol_idx,
+        cand_math_term,
+        vision_weight,
+        out
+    ):
+        """NumPy fallback for the Numba scoring kernel (same signature)."""
+        np.multiply(vision_conf[cand_symbol_idx], vision_weight, out=out)
+        out += cand_math_term
+
+    def rank_topk(scores, row_ends, k, out_positions, out_counts):
+        """NumPy fallback for the Numba top-k kernel (same signature)."""
+        row_start = 0
+        for r in range(row_ends.shape[0]):
+            row_end = row_ends[r]
+            order = np.argsort(-scores[row_start:row_end], kind="stable")[:max(k, 0)]
+            out_positions[r, :len(order)] = order + row_start
+            out_counts[r] = len(order)
+            row_start = row_end
+
+
+    def normalize_predictions(x):
+        """NumPy fallback for the Numba normalization kernel (same signature)."""
+        if x.min() < 0 or x.max() > 1.0:
+            exp_preds = np.exp(x - np.max(x))
+            return exp_preds / exp_preds.sum()
+        return x
+
+
+def warmup():
+    """Trigger JIT compilation so the first ranking call does not pay for it."""
+    out = np.empty(1, dtype=np.float64)
+    # Vision confidences arrive as float32 or float64; compile both variants
+    for conf_dtype in (np.float32, np.float64):
+        normalize_predictions(np.zeros(1, dtype=conf_dtype))
+        score_candidates(
+            np.zeros(1, dtype=conf_dtype),
+            np.zeros(1, dtype=np.int32),
+            np.zeros(1, dtype=np.float64),
+            0.5,
+            out
+        )
+    rank_topk(
+        out,
+        np.ones(1, dtype=np.int64),
+        1,
+        np.empty((1, 1), dtype=np.int64),
+        np.empty(1, dtype=np.int64)
+    )
@@ -8,17 +8,35 @@ This module implements the core ranking logic that combines:
 """
 
 from typing import List, Dict, Optional, Tuple
+import functools
 import numpy as np
 from dataclasses import dataclass
 
 from semantic_engine.mapping_db.symbol_mapping import (
     SymbolMappingDatabase,
     LaTeXCandidate,
-    SymbolMapping
+    SymbolMapping,
+    CandidateArrays,
+    get_default_db
 )
+from semantic_engine.ranking._kernels import (
+    normalize_predictions,
+    rank_topk,
+    score_candidates,
+    warmup
+)
+
 
+@functools.lru_cache(maxsize=512)
+def _placeholder_text(symbol_id: int) -> Tuple[str, str]:
+    """Command and description of the placeholder for an unmapped symbol class."""
+    return (
+        f"\\symbol_{symbol_id}",
+        f"Symbol class {symbol_id} - mapping not yet available"
+    )
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class RankedCandidate:
     """A ranked LaTeX candidate with combined scores."""
     latex_command: str
@@ -28,10 +46,6 @@ class RankedCandidate:
     combined_score: float  # Combined ranking score
     context: str  # Brief context description
     description: Optional[str] = None  # Optional detailed description
-    
-    def __lt__(self, other):
-        """For sorting: higher combined_score comes first."""
-        return self.combined_score > other.combined_score
 
 
 class CandidateRanker:
@@ -61,12 +75,12 @@ class CandidateRanker:
         Initialize the ranker.
         
         Args:
-            mapping_db: Symbol mapping database. If None, creates a new one.
+            mapping_db: Symbol mapping database. If None, uses the shared default one.
             vision_weight: Weight for vision confidence in combined score (default: 0.6)
             math_weight: Weight for math priority in combined score (default: 0.4)
         """
         if mapping_db is None:
-            mapping_db = SymbolMappingDatabase()
+            mapping_db = get_default_db()
         self.mapping_db = mapping_db
         
         # Validate weights
@@ -79,12 +93,19 @@ class CandidateRanker:
         
         self.vision_weight = vision_weight
         self.math_weight = math_weight
+        
+        self._math_term_table: Optional[np.ndarray] = None
+        self._math_term_source: Optional[Tuple[CandidateArrays, float]] = None
+        
+        # Compile the scoring kernel up front (no-op without Numba)
+        warmup()
     
     def rank_candidates(
         self,
         vision_predictions: np.ndarray,
         top_k_symbols: int = 5,
-        top_k_candidates_per_symbol: int = 3
+        top_k_candidates_per_symbol: int = 3,
+        display_k: Optional[int] = None
     ) -> List[RankedCandidate]:
         """
         Rank LaTeX candidates from Vision Engine predictions.
@@ -94,76 +115,98 @@ class CandidateRanker:
                                or (1, num_classes). Values should be in [0, 1] range (apply softmax if needed).
             top_k_symbols: Number of top symbol classes to consider from Vision Engine
             top_k_candidates_per_symbol: Maximum number of LaTeX candidates per symbol class
+            display_k: Maximum number of candidates to return. If None, returns all.
         
         Returns:
             List of RankedCandidate objects, sorted by combined_score (descending)
         """
-        # Flatten and normalize predictions
-        if vision_predictions.ndim > 1:
-            vision_predictions = vision_predictions.flatten()
-        
-        # Apply softmax if values are logits (not already probabilities)
-        # Check if values are in reasonable probability range
-        if vision_predictions.min() < 0 or vision_predictions.max() > 1.0:
-            # Likely logits, apply softmax
-            exp_preds = np.exp(vision_predictions - np.max(vision_predictions))
-            vision_predictions = exp_preds / exp_preds.sum()
-        
-        # Get top-k symbol classes from Vision Engine
-        top_k_indices = np.argsort(vision_predictions)[-top_k_symbols:][::-1]
+        # Flatten (a view for contiguous input, no copy); float32 stays float32
+        vision_predictions = np.ravel(vision_predictions)
+        if vision_predictions.dtype != np.float32:
+            vision_predictions = vision_predictions.astype(np.float64, copy=False)
+        
+        # Apply softmax if values are logits (not already probabilities).
+        # Inputs already in [0, 1] pass through untouched.
+        if vision_predictions.size:
+            vision_predictions = normalize_predictions(vision_predictions)
+        
+        # Get top-k symbol classes from Vision Engine.
+        # argpartition selects the k largest in linear time, so only those k
+        # entries need sorting instead of the full class vector.
+        if top_k_symbols >= vision_predictions.size:
+            # Every class is selected, so partitioning first would be wasted work
+            top_k_indices = np.argsort(-vision_predictions)
+        else:
+            top_k_indices = np.argpartition(vision_predictions, -top_k_symbols)[-top_k_symbols:]
+            top_k_indices = top_k_indices[np.argsort(-vision_predictions[top_k_indices])]
         top_k_confidences = vision_predictions[top_k_indices]
         
-        # Collect all candidates from top-k symbols
-        all_candidates = []
-        
-        for symbol_id, confidence in zip(top_k_indices, top_k_confidences):
-            # Get LaTeX candidates for this symbol
-            latex_candidates = self.mapping_db.get_ranked_candidates(symbol_id)
-            
-            if not latex_candidates:
-                # No mapping found, create a default candidate
-                # This handles symbols not yet in the mapping database
-                all_candidates.append(
-                    RankedCandidate(
-                        latex_command=f"\\symbol_{symbol_id}",  # Placeholder
-                        symbol_class_id=int(symbol_id),
-                        vision_confidence=float(confidence),
-                        math_priority=0.5,  # Default neutral priority
-                        combined_score=float(confidence * self.vision_weight + 0.5 * self.math_weight),
-                        context="symbol (no mapping available)",
-                        description=f"Symbol class {symbol_id} - mapping not yet available"
-                    )
-                )
-                continue
-            
-            # Create ranked candidates for each LaTeX option
-            for latex_cand in latex_candidates[:top_k_candidates_per_symbol]:
-                combined_score = (
-                    confidence * self.vision_weight +
-                    latex_cand.math_priority * self.math_weight
-                )
-                
-                all_candidates.append(
-                    RankedCandidate(
-                        latex_command=latex_cand.command,
-                        symbol_class_id=int(symbol_id),
-                        vision_confidence=float(confidence),
-                        math_priority=latex_cand.math_priority,
-                        combined_score=combined_score,
-                        context=latex_cand.context,
-                        description=latex_cand.description
-                    )
-                )
+        return self._rank_symbols(
+            top_k_indices.reshape(1, -1),
+            top_k_confidences.reshape(1, -1),
+            top_k_candidates_per_symbol,
+            display_k
+        )[0]
+    
+    def rank_candidates_batch(
+        self,
+        vision_predictions: np.ndarray,
+        top_k_symbols: int = 5,
+        top_k_candidates_per_symbol: int = 3,
+        display_k: Optional[int] = None
+    ) -> List[List[RankedCandidate]]:
+        """
+        Rank LaTeX candidates for a batch of Vision Engine predictions.
+        
+        Equivalent to calling rank_candidates() on each row, but the top-k selection
+        and scoring run once over the whole batch.
+        
+        Args:
+            vision_predictions: Vision Engine outputs (logits or probabilities) of shape
+                               (batch_size, num_classes). Rows outside [0, 1] get softmax.
+            top_k_symbols: Number of top symbol classes to consider per row
+            top_k_candidates_per_symbol: Maximum number of LaTeX candidates per symbol class
+            display_k: Maximum number of candidates to return. If None, returns all.
+        
+        Returns:
+            One list of RankedCandidate objects per row, each sorted by combined_score (descending)
+        """
+        # Work on a copy; float32 input stays float32, anything else becomes float64
+        predictions = np.array(vision_predictions, ndmin=2)
+        if predictions.dtype != np.float32:
+            predictions = predictions.astype(np.float64)
         
-        # Sort by combined score (descending)
-        all_candidates.sort()
+        # Apply softmax to the rows that look like logits
+        logit_rows = (predictions.min(axis=1) < 0) | (predictions.max(axis=1) > 1.0)
+        if logit_rows.any():
+            exp_preds = predictions[logit_rows]
+            exp_preds = np.exp(exp_preds - exp_preds.max(axis=1, keepdims=True))
+            predictions[logit_rows] = exp_preds / exp_preds.sum(axis=1, keepdims=True)
         
-        return all_candidates
+        # Top-k symbol classes per row, sorted by confidence
+        if top_k_symbols >= predictions.shape[1]:
+            # Every class is selected, so partitioning first would be wasted work
+            top_k_indices = np.argsort(-predictions, axis=1)
+            top_k_confidences = np.take_along_axis(predictions, top_k_indices, axis=1)
+        else:
+            top_k_indices = np.argpartition(predictions, -top_k_symbols, axis=1)[:, -top_k_symbols:]
+            top_k_confidences = np.take_along_axis(predictions, top_k_indices, axis=1)
+            order = np.argsort(-top_k_confidences, axis=1)
+            top_k_indices = np.take_along_axis(top_k_indices, order, axis=1)
+            top_k_confidences = np.take_along_axis(top_k_confidences, order, axis=1)
+        
+        return self._rank_symbols(
+            top_k_indices,
+            top_k_confidences,
+            top_k_candidates_per_symbol,
+            display_k
+        )
     
     def rank_candidates_from_top_k(
         self,
         top_k_symbols: List[Tuple[int, float]],
-        top_k_candidates_per_symbol: int = 3
+        top_k_candidates_per_symbol: int = 3,
+        display_k: Optional[int] = None
     ) -> List[RankedCandidate]:
         """
         Rank LaTeX candidates from a list of top-k symbol predictions.
@@ -173,54 +216,164 @@ class CandidateRanker:
         Args:
             top_k_symbols: List of (symbol_class_id, confidence) tuples
             top_k_candidates_per_symbol: Maximum number of LaTeX candidates per symbol class
+            display_k: Maximum number of candidates to return. If None, returns all.
         
         Returns:
             List of RankedCandidate objects, sorted by combined_score (descending)
         """
-        all_candidates = []
-        
-        for symbol_id, confidence in top_k_symbols:
-            # Get LaTeX candidates for this symbol
-            latex_candidates = self.mapping_db.get_ranked_candidates(symbol_id)
-            
-            if not latex_candidates:
-                # No mapping found, create a default candidate
-                all_candidates.append(
-                    RankedCandidate(
-                        latex_command=f"\\symbol_{symbol_id}",
-                        symbol_class_id=symbol_id,
-                        vision_confidence=confidence,
-                        math_priority=0.5,
-                        combined_score=confidence * self.vision_weight + 0.5 * self.math_weight,
-                        context="symbol (no mapping available)",
-                        description=f"Symbol class {symbol_id} - mapping not yet available"
+        symbol_ids = np.array([symbol_id for symbol_id, _ in top_k_symbols], dtype=np.int64)
+        confidences = np.array([confidence for _, confidence in top_k_symbols], dtype=np.float64)
+        
+        return self._rank_symbols(
+            symbol_ids.reshape(1, -1),
+            confidences.reshape(1, -1),
+            top_k_candidates_per_symbol,
+            display_k
+        )[0]
+    
+    def _get_math_term_table(self, arrays: CandidateArrays) -> np.ndarray:
+        """
+        Get the weighted math priority term (math_weight * priority) per global
+        candidate index, as float64.
+        
+        The priority half of the combined score is fixed for a given database
+        and weight, so it is precomputed here instead of per ranking call. A
+        trailing neutral priority of 0.5 is appended so that placeholder
+        candidates (index -1) are resolved by the same gather as mapped ones.
+        Priorities are read from the candidates themselves rather than the
+        float32 column, so combined_score matches the reported math_priority.
+        Rebuilt only when the database hands out new candidate arrays or the
+        math weight changes.
+        """
+        source_arrays, source_weight = self._math_term_source or (None, None)
+        if source_arrays is not arrays or source_weight != self.math_weight:
+            priorities = np.fromiter(
+                (c.math_priority for c in arrays.candidates),
+                dtype=np.float64,
+                count=len(arrays.candidates)
+            )
+            priorities = np.append(priorities, 0.5)
+            self._math_term_table = priorities * self.math_weight
+            self._math_term_source = (arrays, self.math_weight)
+        return self._math_term_table
+    
+    def _rank_symbols(
+        self,
+        symbol_ids: np.ndarray,
+        confidences: np.ndarray,
+        top_k_candidates_per_symbol: int,
+        display_k: Optional[int] = None
+    ) -> List[List[RankedCandidate]]:
+        """
+        Score and rank the LaTeX candidates of selected symbols.
+        
+        Args:
+            symbol_ids: Symbol class IDs of shape (batch_size, num_symbols)
+            confidences: Vision confidences of shape (batch_size, num_symbols)
+            top_k_candidates_per_symbol: Maximum number of LaTeX candidates per symbol class
+            display_k: Maximum number of candidates to return. If None, returns all.
+        
+        Returns:
+            One list of RankedCandidate objects per row, sorted by combined_score (descending)
+        """
+        num_rows, symbols_per_row = symbol_ids.shape
+        if symbols_per_row == 0:
+            return [[] for _ in range(num_rows)]
+        
+        arrays = self.mapping_db.get_candidate_arrays()
+        offsets = arrays.offsets
+        
+        # Candidate range of every selected symbol in the columnar arrays
+        flat_ids = symbol_ids.reshape(-1).astype(np.int64)
+        in_range = (flat_ids >= 0) & (flat_ids < len(offsets) - 1)
+        starts = np.zeros(flat_ids.size, dtype=np.int64)
+        counts = np.zeros(flat_ids.size, dtype=np.int64)
+        starts[in_range] = offsets[flat_ids[in_range]]
+        counts[in_range] = offsets[flat_ids[in_range] + 1] - starts[in_range]
+        
+        # Flatten the candidates of all symbols into parallel arrays: the position
+        # of the owning symbol and the candidate's global index in the columns.
+        # Symbols without a mapping contribute one placeholder (index -1).
+        slots = np.where(counts == 0, 1, np.minimum(counts, max(top_k_candidates_per_symbol, 0)))
+        cand_symbol_idx = np.repeat(np.arange(flat_ids.size, dtype=np.int32), slots)
+        first_slot = np.cumsum(slots) - slots
+        cand_index = (
+            starts[cand_symbol_idx] +
+            np.arange(cand_symbol_idx.size) - first_slot[cand_symbol_idx]
+        )
+        cand_index[counts[cand_symbol_idx] == 0] = -1
+        
+        cand_math_term = self._get_math_term_table(arrays)[cand_index]
+        
+        scores = np.empty(len(cand_index), dtype=np.float64)
+        vision_conf = confidences.reshape(-1)
+        if vision_conf.dtype != np.float32:
+            vision_conf = vision_conf.astype(np.float64)
+        score_candidates(
+            vision_conf,
+            cand_symbol_idx,
+            cand_math_term,
+            self.vision_weight,
+            scores
+        )
+        
+        # Top candidates of each row in descending score order (stable, so ties
+        # keep database order). Without a display limit every candidate is kept.
+        row_lengths = slots.reshape(num_rows, symbols_per_row).sum(axis=1)
+        limit = int(row_lengths.max(initial=0))
+        if display_k is not None:
+            limit = min(max(display_k, 0), limit)
+        top_positions = np.empty((num_rows, limit), dtype=np.int64)
+        top_counts = np.empty(num_rows, dtype=np.int64)
+        rank_topk(scores, np.cumsum(row_lengths), limit, top_positions, top_counts)
+        
+        symbol_id_list = symbol_ids.reshape(-1).tolist()
+        confidence_list = confidences.reshape(-1).tolist()
+        cand_symbol_list = cand_symbol_idx.tolist()
+        cand_index_list = cand_index.tolist()
+        score_list = scores.tolist()
+        
+        ranked = []
+        for positions, count in zip(top_positions.tolist(), top_counts.tolist()):
+            # Materialize RankedCandidate objects only for the returned positions
+            row = []
+            for p in positions[:count]:
+                i = cand_symbol_list[p]
+                j = cand_index_list[p]
+                symbol_id = symbol_id_list[i]
+                confidence = confidence_list[i]
+                
+                if j < 0:
+                    # No mapping found, create a default candidate
+                    command, description = _placeholder_text(symbol_id)
+                    row.append(
+                        RankedCandidate(
+                            latex_command=command,
+                            symbol_class_id=symbol_id,
+                            vision_confidence=confidence,
+                            math_priority=0.5,
+                            combined_score=score_list[p],
+                            context="symbol (no mapping available)",
+                            description=description
+                        )
                     )
-                )
-                continue
-            
-            # Create ranked candidates for each LaTeX option
-            for latex_cand in latex_candidates[:top_k_candidates_per_symbol]:
-                combined_score = (
-                    confidence * self.vision_weight +
-                    latex_cand.math_priority * self.math_weight
-                )
+                    continue
                 
-                all_candidates.append(
+                latex_cand = arrays.candidates[j]
+                row.append(
                     RankedCandidate(
-                        latex_command=latex_cand.command,
+                        latex_command=arrays.commands[j],
                         symbol_class_id=symbol_id,
                         vision_confidence=confidence,
                         math_priority=latex_cand.math_priority,
-                        combined_score=combined_score,
+                        combined_score=score_list[p],
                         context=latex_cand.context,
                         description=latex_cand.description
                     )
                 )
+            ranked.append(row)
         
-        # Sort by combined score (descending)
-        all_candidates.sort()
-        
-        return all_candidates
+        return ranked
 
 
 def create_default_ranker() -> CandidateRanker:
@@ -8,6 +8,8 @@ for preview purposes in the suggestion UI.
 from semantic_engine.rendering.latex_renderer import (
     LaTeXRenderer,
     create_renderer,
+    load_previews,
+    precompute_previews,
     render_latex_to_image,
     render_latex_to_svg
 )
@@ -15,6 +17,8 @@ from semantic_engine.rendering.latex_renderer import (
 __all__ = [
     "LaTeXRenderer",
     "create_renderer",
+    "load_previews",
+    "precompute_previews",
     "render_latex_to_image",
     "render_latex_to_svg"
 ]
@@ -8,16 +8,22 @@ for preview purposes. It supports multiple backends:
 - Optional: MathJax/KaTeX for web deployment
 """
 
+import argparse
 import os
 import tempfile
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 import warnings
 
+import numpy as np
+
 try:
     import matplotlib
     matplotlib.use('Agg')  # Non-interactive backend
-    import matplotlib.pyplot as plt
+    # Figures are created directly rather than through pyplot, so they are not
+    # registered globally and are freed with the renderer
+    from matplotlib.figure import Figure
     from matplotlib import font_manager
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
@@ -30,6 +36,38 @@ except ImportError:
     PIL_AVAILABLE = False
 
 
+# Number of (command, dpi, fontsize) renders kept by render_cached()
+RENDER_CACHE_SIZE = 256
+
+# Default canvas size and margin (pixels) for the PIL plain-text fallback;
+# text that does not fit gets a larger canvas
+PIL_CANVAS_SIZE = (100, 50)
+PIL_MARGIN = 10
+
+
+def load_previews(filepath: str) -> Tuple[Dict[str, bytes], int, int]:
+    """
+    Load a preview archive written by precompute_previews().
+    
+    Args:
+        filepath: Path to the .npz preview archive
+    
+    Returns:
+        Tuple of ({latex_command: png_bytes}, dpi, fontsize)
+    """
+    with np.load(filepath, allow_pickle=False) as data:
+        offsets = data["offsets"].tolist()
+        commands = data["commands"].tobytes().decode("utf-8").split("\0") if len(offsets) > 1 else []
+        images = data["images"].tobytes()
+        dpi = int(data["dpi"])
+        fontsize = int(data["fontsize"])
+    previews = {
+        command: images[offsets[i]:offsets[i + 1]]
+        for i, command in enumerate(commands)
+    }
+    return previews, dpi, fontsize
+
+
 class LaTeXRenderer:
     """
     Renders LaTeX commands to images for preview purposes.
@@ -42,15 +80,24 @@ class LaTeXRenderer:
     - External LaTeX compiler (highest quality)
     """
     
-    def __init__(self, backend: str = "matplotlib"):
+    def __init__(self, backend: str = "matplotlib", precomputed_path: Optional[str] = None):
         """
         Initialize the renderer.
         
         Args:
             backend: Rendering backend ("matplotlib" or "pil")
+            precomputed_path: Optional preview archive from precompute_previews().
+                              Commands found there are served without rendering.
         """
         self.backend = backend
         
+        # Precomputed previews, valid only for the dpi/fontsize they were rendered at
+        self._previews: Dict[str, bytes] = {}
+        self._previews_settings: Optional[Tuple[int, int]] = None
+        if precomputed_path is not None:
+            self._previews, dpi, fontsize = load_previews(precomputed_path)
+            self._previews_settings = (dpi, fontsize)
+        
         if backend == "matplotlib" and not MATPLOTLIB_AVAILABLE:
             raise ImportError(
                 "matplotlib is required for matplotlib backend. "
@@ -61,6 +108,41 @@ class LaTeXRenderer:
                 "Pillow is required for PIL backend. "
                 "Install with: pip install Pillow"
             )
+        
+        # One figure reused for every matplotlib render, created on first use
+        self._fig = None
+        self._ax = None
+        
+        # PIL fallback: load the font and allocate the blank canvas once, plus a
+        # draw handle on it for measuring text (measuring never modifies it)
+        self._font = None
+        self._blank_img = None
+        self._measure_draw = None
+        if backend == "pil":
+            try:
+                # Try to use a default font
+                self._font = ImageFont.load_default()
+            except Exception:
+                self._font = None
+            self._blank_img = Image.new('RGB', PIL_CANVAS_SIZE, color='white')
+            self._measure_draw = ImageDraw.Draw(self._blank_img)
+        
+        # (latex_command, dpi, fontsize) -> image bytes, least recently used first.
+        # A plain dict rather than an lru_cache over a bound method, which would
+        # make the renderer reference itself.
+        self._render_cache: Dict[Tuple[str, int, int], Optional[bytes]] = OrderedDict()
+    
+    def close(self):
+        """Release the matplotlib figure and cached renders."""
+        self._fig = None
+        self._ax = None
+        self._render_cache.clear()
+    
+    def __enter__(self) -> 'LaTeXRenderer':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def render_to_image(
         self,
@@ -81,6 +163,15 @@ class LaTeXRenderer:
         Returns:
             Image bytes if output_path is None, otherwise None
         """
+        if self._previews_settings == (dpi, fontsize):
+            image = self._previews.get(latex_command)
+            if image is not None:
+                if output_path:
+                    with open(output_path, 'wb') as f:
+                        f.write(image)
+                    return None
+                return image
+        
         if self.backend == "matplotlib":
             return self._render_with_matplotlib(latex_command, output_path, dpi, fontsize)
         elif self.backend == "pil":
@@ -88,6 +179,38 @@ class LaTeXRenderer:
         else:
             raise ValueError(f"Unknown backend: {self.backend}")
     
+    def render_cached(
+        self,
+        latex_command: str,
+        dpi: int = 100,
+        fontsize: int = 14
+    ) -> Optional[bytes]:
+        """
+        Render a LaTeX command to image bytes, reusing earlier renders.
+        
+        The suggestion list re-renders the same commands (\\sum, \\alpha, ...)
+        constantly; the most recent RENDER_CACHE_SIZE results are kept.
+        
+        Args:
+            latex_command: LaTeX command (e.g., "\\sum", "\\alpha")
+            dpi: Resolution in dots per inch
+            fontsize: Font size for rendering
+        
+        Returns:
+            Image bytes, or None if rendering failed
+        """
+        key = (latex_command, dpi, fontsize)
+        try:
+            self._render_cache.move_to_end(key)
+            return self._render_cache[key]
+        except KeyError:
+            pass
+        image = self.render_to_image(latex_command, None, dpi, fontsize)
+        self._render_cache[key] = image
+        if len(self._render_cache) > RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return image
+    
     def _render_with_matplotlib(
         self,
         latex_command: str,
@@ -103,8 +226,12 @@ class LaTeXRenderer:
         else:
             latex_text = latex_command
         
-        # Create figure with minimal size
-        fig, ax = plt.subplots(figsize=(2, 1))
+        # Reuse the renderer's figure, creating it on the first render
+        if self._fig is None:
+            self._fig = Figure(figsize=(2, 1))
+            self._ax = self._fig.add_subplot()
+        fig, ax = self._fig, self._ax
+        ax.clear()
         ax.axis('off')
         
         try:
@@ -116,21 +243,18 @@ class LaTeXRenderer:
             
             # Save or return bytes
             if output_path:
-                plt.savefig(output_path, dpi=dpi, bbox_inches='tight', 
+                fig.savefig(output_path, dpi=dpi, bbox_inches='tight', 
                            pad_inches=0.1, transparent=True)
-                plt.close(fig)
                 return None
             else:
                 # Save to temporary buffer
                 import io
                 buf = io.BytesIO()
-                plt.savefig(buf, format='png', dpi=dpi, bbox_inches='tight',
+                fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight',
                            pad_inches=0.1, transparent=True)
-                plt.close(fig)
                 buf.seek(0)
                 return buf.read()
         except Exception as e:
-            plt.close(fig)
             warnings.warn(f"Failed to render LaTeX '{latex_command}': {e}")
             # Return a placeholder or None
             return None
@@ -150,19 +274,31 @@ class LaTeXRenderer:
             "Rendering as plain text. Use matplotlib backend for LaTeX support."
         )
         
-        # Create a simple text image
-        img = Image.new('RGB', (100, 50), color='white')
+        text = latex_command.replace('\\', '')
+        origin = (PIL_MARGIN, PIL_MARGIN)
+        
+        # Measure first; copy the cached blank canvas only if the text fits
+        left, top, right, bottom = self._measure_draw.textbbox(origin, text, font=self._font)
+        width = int(right) + PIL_MARGIN
+        height = int(bottom) + PIL_MARGIN
+        if width <= PIL_CANVAS_SIZE[0] and height <= PIL_CANVAS_SIZE[1]:
+            img = self._blank_img.copy()
+        else:
+            img = Image.new(
+                'RGB',
+                (max(width, PIL_CANVAS_SIZE[0]), max(height, PIL_CANVAS_SIZE[1])),
+                color='white'
+            )
         draw = ImageDraw.Draw(img)
+        draw.text(origin, text, fill='black', font=self._font)
         
-        try:
-            # Try to use a default font
-            font = ImageFont.load_default()
-        except:
-            font = None
-        
-        # Draw text
-        text = latex_command.replace('\\', '')
-        draw.text((10, 10), text, fill='black', font=font)
+        # Crop to the measured text plus margin
+        img = img.crop((
+            max(left - PIL_MARGIN, 0),
+            max(top - PIL_MARGIN, 0),
+            min(right + PIL_MARGIN, img.width),
+            min(bottom + PIL_MARGIN, img.height)
+        ))
         
         if output_path:
             img.save(output_path)
@@ -195,9 +331,68 @@ class LaTeXRenderer:
         return None
 
 
-def create_renderer(backend: str = "matplotlib") -> LaTeXRenderer:
+def create_renderer(
+    backend: str = "matplotlib",
+    precomputed_path: Optional[str] = None
+) -> LaTeXRenderer:
     """Create a LaTeX renderer with the specified backend."""
-    return LaTeXRenderer(backend=backend)
+    return LaTeXRenderer(backend=backend, precomputed_path=precomputed_path)
+
+
+def precompute_previews(
+    output_path: str,
+    mapping_db=None,
+    dpi: int = 100,
+    fontsize: int = 14
+) -> int:
+    """
+    Render every LaTeX command in the mapping database once and save the PNGs.
+    
+    The candidate vocabulary is fixed, so previews can be built ahead of time
+    and loaded with LaTeXRenderer(precomputed_path=...).
+    
+    Args:
+        output_path: Path to save the .npz preview archive
+        mapping_db: SymbolMappingDatabase to take commands from. If None, uses
+                    the shared default database.
+        dpi: Resolution in dots per inch
+        fontsize: Font size for rendering
+    
+    Returns:
+        Number of previews saved
+    """
+    if mapping_db is None:
+        from semantic_engine.mapping_db.symbol_mapping import get_default_db
+        mapping_db = get_default_db()
+    
+    # Unique commands, in mapping order
+    commands = list(dict.fromkeys(
+        cand.command
+        for mapping in mapping_db.mappings.values()
+        for cand in mapping.latex_candidates
+    ))
+    
+    rendered_commands = []
+    images = []
+    with LaTeXRenderer(backend="matplotlib") as renderer:
+        for command in commands:
+            image = renderer.render_to_image(command, dpi=dpi, fontsize=fontsize)
+            # Commands that fail to render are left to on-demand rendering
+            if image is not None:
+                rendered_commands.append(command)
+                images.append(image)
+    
+    offsets = np.zeros(len(images) + 1, dtype=np.int64)
+    np.cumsum([len(image) for image in images], out=offsets[1:])
+    np.savez(
+        output_path,
+        commands=np.frombuffer("\0".join(rendered_commands).encode("utf-8"), dtype=np.uint8),
+        offsets=offsets,
+        images=np.frombuffer(b"".join(images), dtype=np.uint8),
+        dpi=np.int64(dpi),
+        fontsize=np.int64(fontsize)
+    )
+    return len(images)
 
 
 def render_latex_to_image(
@@ -220,8 +415,8 @@ def render_latex_to_image(
     Returns:
         Image bytes if output_path is None, otherwise None
     """
-    renderer = create_renderer(backend)
-    return renderer.render_to_image(latex_command, output_path, dpi, fontsize)
+    with create_renderer(backend) as renderer:
+        return renderer.render_to_image(latex_command, output_path, dpi, fontsize)
 
 
 def render_latex_to_svg(
@@ -238,6 +433,39 @@ def render_latex_to_svg(
     Returns:
         SVG content as string if output_path is None, otherwise None
     """
-    renderer = create_renderer()
-    return renderer.render_to_svg(latex_command, output_path)
+    with create_renderer() as renderer:
+        return renderer.render_to_svg(latex_command, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LaTeX preview rendering')
+    
+    parser.add_argument('--precompute', action='store_true',
+                        help='Render every command in the mapping database to a preview archive')
+    parser.add_argument('--out', type=str, default='previews.npz',
+                        help='Path to save the preview archive (default: previews.npz)')
+    parser.add_argument('--mapping', type=str, default=None,
+                        help='Full mapping file to include (default: built-in mappings only)')
+    parser.add_argument('--dpi', type=int, default=100,
+                        help='Resolution in dots per inch (default: 100)')
+    parser.add_argument('--fontsize', type=int, default=14,
+                        help='Font size (default: 14)')
+    
+    args = parser.parse_args()
+    
+    if not args.precompute:
+        parser.print_help()
+        return
+    
+    mapping_db = None
+    if args.mapping:
+        from semantic_engine.mapping_db.symbol_mapping import SymbolMappingDatabase
+        mapping_db = SymbolMappingDatabase()
+        mapping_db.load_full_mapping(args.mapping)
+    
+    count = precompute_previews(args.out, mapping_db, dpi=args.dpi, fontsize=args.fontsize)
+    print(f"Saved {count} previews to {args.out}")
+
 
+if __name__ == '__main__':
+    main()
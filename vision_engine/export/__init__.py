@@ -6,13 +6,16 @@ Supports cross-platform deployment:
 - CoreML: iOS, iPadOS, and macOS native deployment
 """
 
-from .onnx_export import export_to_onnx, export_checkpoint_to_onnx
+from .onnx_export import export_to_onnx, export_checkpoint_to_onnx, create_inference_session
+from .onnx_quantize import quantize_onnx_model
 from .coreml_export import export_to_coreml, export_checkpoint_to_coreml
 from .export_all import export_all_formats
 
 __all__ = [
     "export_to_onnx",
     "export_checkpoint_to_onnx",
+    "create_inference_session",
+    "quantize_onnx_model",
     "export_to_coreml",
     "export_checkpoint_to_coreml",
     "export_all_formats"
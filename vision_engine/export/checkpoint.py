@@ -0,0 +1,61 @@
+"""
+Checkpoint loading shared by the ONNX and CoreML exporters.
+"""
+
+import functools
+import os
+import torch
+from typing import Tuple
+
+from ..models import SymbolClassifierCNN, create_model
+
+
+@functools.lru_cache(maxsize=4)
+def _load_checkpoint(path: str, mtime: float) -> dict:
+    """
+    Load a checkpoint on CPU, memory-mapping tensors instead of reading the
+    whole file into RAM.
+    
+    Cached on (path, mtime) so repeated exports of the same checkpoint skip
+    deserialization; the returned dict is shared and must be treated as
+    read-only. Call _load_checkpoint.cache_clear() to release it.
+    """
+    return torch.load(path, map_location='cpu', mmap=True)
+
+
+def load_checkpoint_model(
+    checkpoint_path: str,
+    num_classes: int = 369,
+    input_size: Tuple[int, int] = (64, 64)
+) -> Tuple[SymbolClassifierCNN, Tuple[int, int]]:
+    """
+    Load a model checkpoint on CPU, ready for export.
+    
+    Args:
+        checkpoint_path: Path to PyTorch checkpoint file
+        num_classes: Number of classes (default: 369)
+        input_size: Input image size (default: (64, 64))
+    
+    Returns:
+        Tuple of (model in eval mode on CPU, input size). The checkpoint's
+        model_config, when present, overrides num_classes and input_size.
+    """
+    checkpoint = _load_checkpoint(str(checkpoint_path), os.path.getmtime(checkpoint_path))
+    
+    # Get model config from checkpoint if available
+    if 'model_config' in checkpoint:
+        config = checkpoint['model_config']
+        num_classes = config.get('num_classes', num_classes)
+        input_size = (config.get('input_size', input_size[0]), input_size[1])
+    
+    # Create model and load on CPU (ONNX and CoreML export require CPU)
+    model = create_model(num_classes=num_classes, input_size=input_size[0])
+    # Copy rather than assign: the cached state-dict tensors must not become
+    # parameters of a model the caller may modify
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model.eval()
+    # create_model() builds on CPU and map_location='cpu' keeps the weights
+    # there, so no .to('cpu') pass over the parameters is needed
+    assert next(model.parameters()).device.type == 'cpu'
+    
+    return model, input_size
@@ -7,56 +7,148 @@ iOS, iPadOS, and macOS platforms.
 
 import torch
 import coremltools as ct
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 import os
 
 from ..models import SymbolClassifierCNN
+from .checkpoint import load_checkpoint_model
+from .program import (
+    MIN_TORCH_EXPORT_VERSION,
+    capture_program,
+    is_exported_program,
+    torch_version_at_least,
+    version_tuple
+)
+
+
+# Supported weight formats for the exported model
+QUANTIZATION_MODES = ('none', 'fp16', 'int8')
+
+# Flexible batch dimension of the exported model: callers may batch up to
+# MAX_BATCH_SIZE symbols per prediction. Tracing uses a representative batch
+# larger than 1 so the batch size is not baked into the graph.
+MAX_BATCH_SIZE = 32
+TRACE_BATCH_SIZE = 4
+
+# Oldest coremltools release that converts torch.export programs with a dynamic
+# batch dimension (7.x support was experimental and static-shape only). Older
+# releases fall back to the TorchScript tracing path.
+MIN_COREMLTOOLS_EXPORT_VERSION = (8, 0)
+
+
+def torch_export_supported() -> bool:
+    """Check whether torch and coremltools are new enough to skip TorchScript tracing."""
+    return (
+        hasattr(torch, 'export')
+        and torch_version_at_least(MIN_TORCH_EXPORT_VERSION)
+        and version_tuple(ct.__version__) >= MIN_COREMLTOOLS_EXPORT_VERSION
+    )
 
 
 def export_to_coreml(
-    model: SymbolClassifierCNN,
+    model: Union[SymbolClassifierCNN, str, 'torch.export.ExportedProgram'],
     output_path: str,
     input_size: Tuple[int, int] = (64, 64),
     class_labels: Optional[list] = None,
-    verify: bool = True
+    verify: bool = True,
+    quantization: str = 'fp16',
+    num_classes: int = 369
 ) -> str:
     """
     Export PyTorch model to CoreML format.
     
     Args:
-        model: Trained SymbolClassifierCNN model
+        model: Trained SymbolClassifierCNN model, a checkpoint path to load it from,
+               or an ExportedProgram from capture_program() to convert as-is
         output_path: Path to save the CoreML model (.mlpackage)
         input_size: Input image size (height, width)
         class_labels: Optional list of class labels (for metadata)
         verify: Whether to verify the exported model (default: True)
+        quantization: Weight format: 'none' (FP32), 'fp16' or 'int8' (default: 'fp16').
+                      Quantized models are ML Programs and need iOS 15+ (fp16)
+                      or iOS 16+ (int8).
+        num_classes: Number of classes when loading from a checkpoint (default: 369)
     
     Returns:
         Path to the exported CoreML model
     """
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"quantization must be one of {QUANTIZATION_MODES}, got {quantization!r}"
+        )
+    
+    program = None
+    if isinstance(model, str):
+        model, input_size = load_checkpoint_model(model, num_classes, input_size)
+    elif is_exported_program(model):
+        program = model
+        model = program.module()
     model.eval()
     
     # Create dummy input
-    dummy_input = torch.randn(1, 1, input_size[0], input_size[1])
-    
-    # Trace the model
-    print(f"Tracing model for CoreML export...")
-    print(f"Input shape: {dummy_input.shape}")
+    dummy_input = torch.randn(TRACE_BATCH_SIZE, 1, input_size[0], input_size[1])
+    input_type = ct.TensorType(
+        name="input",
+        shape=ct.Shape(shape=(
+            ct.RangeDim(lower_bound=1, upper_bound=MAX_BATCH_SIZE, default=1),
+            1,
+            input_size[0],
+            input_size[1]
+        ))
+    )
     
-    # Trace the model (convert to TorchScript)
-    traced_model = torch.jit.trace(model, dummy_input)
+    # Capture the model graph. ML Program conversions take a torch.export
+    # program directly; the FP32 neural network target still needs TorchScript.
+    if quantization != 'none' and torch_export_supported():
+        print(f"Exporting model with torch.export for CoreML export...")
+        print(f"Input shape: {dummy_input.shape}")
+        if program is not None:
+            source_model = program
+        else:
+            source_model = capture_program(model, input_size, max_batch_size=MAX_BATCH_SIZE)
+    else:
+        print(f"Tracing model for CoreML export...")
+        print(f"Input shape: {dummy_input.shape}")
+        
+        # Trace the model (convert to TorchScript)
+        source_model = torch.jit.trace(model, dummy_input)
     
     # Convert to CoreML
     print(f"Converting to CoreML format...")
     print(f"Output path: {output_path}")
     
     # Convert to CoreML
-    # Use simpler API for better compatibility
-    mlmodel = ct.convert(
-        traced_model,
-        inputs=[ct.TensorType(name="input", shape=dummy_input.shape)],
-        minimum_deployment_target=ct.target.iOS13,  # Support iOS 13+
-        compute_units=ct.ComputeUnit.ALL,  # Use CPU, GPU, and Neural Engine
-    )
+    if quantization == 'none':
+        # Use simpler API for better compatibility
+        mlmodel = ct.convert(
+            source_model,
+            inputs=[input_type],
+            minimum_deployment_target=ct.target.iOS13,  # Support iOS 13+
+            compute_units=ct.ComputeUnit.ALL,  # Use CPU, GPU, and Neural Engine
+        )
+    else:
+        # Reduced-precision weights require the ML Program format; int8 weights
+        # are compressed on top of an FP16 program
+        print(f"Quantizing weights to {quantization.upper()}...")
+        mlmodel = ct.convert(
+            source_model,
+            inputs=[input_type],
+            convert_to="mlprogram",
+            compute_precision=ct.precision.FLOAT16,
+            minimum_deployment_target=(
+                ct.target.iOS16 if quantization == 'int8' else ct.target.iOS15
+            ),
+            compute_units=ct.ComputeUnit.ALL,  # Use CPU, GPU, and Neural Engine
+        )
+        if quantization == 'int8':
+            import coremltools.optimize.coreml as cto
+            config = cto.OptimizationConfig(
+                global_config=cto.OpLinearQuantizerConfig(
+                    mode="linear_symmetric",
+                    dtype="int8"
+                )
+            )
+            mlmodel = cto.linear_quantize_weights(mlmodel, config=config)
     
     # Add metadata
     mlmodel.author = "Intelligent Handwritten Math Recognition"
@@ -97,7 +189,8 @@ def export_checkpoint_to_coreml(
     num_classes: int = 369,
     input_size: Tuple[int, int] = (64, 64),
     class_labels: Optional[list] = None,
-    device: str = 'cpu'
+    device: str = 'cpu',
+    quantization: str = 'fp16'
 ) -> str:
     """
     Export a model checkpoint to CoreML format.
@@ -109,6 +202,7 @@ def export_checkpoint_to_coreml(
         input_size: Input image size (default: (64, 64))
         class_labels: Optional list of class labels (for metadata)
         device: Device to load the model on (default: 'cpu')
+        quantization: Weight format: 'none', 'fp16' or 'int8' (default: 'fp16')
     
     Returns:
         Path to the exported CoreML model
@@ -117,29 +211,12 @@ def export_checkpoint_to_coreml(
         CoreML export should be done on CPU to ensure compatibility.
         The model will be loaded on the specified device but moved to CPU for export.
     """
-    from ..models import create_model
-    
-    # Load checkpoint (use CPU for loading to ensure compatibility)
-    load_device = 'cpu'  # Always load on CPU for CoreML export compatibility
-    checkpoint = torch.load(checkpoint_path, map_location=load_device)
-    
-    # Get model config from checkpoint if available
-    if 'model_config' in checkpoint:
-        config = checkpoint['model_config']
-        num_classes = config.get('num_classes', num_classes)
-        input_size = (config.get('input_size', input_size[0]), input_size[1])
-    
-    # Create model and load on CPU (CoreML export requires CPU)
-    model = create_model(num_classes=num_classes, input_size=input_size[0])
-    model.load_state_dict(checkpoint['model_state_dict'])
-    model.eval()
-    model = model.to('cpu')  # Ensure model is on CPU for export
-    
-    # Export (CoreML export must be done on CPU)
+    # Load on CPU and export (CoreML export must be done on CPU)
     return export_to_coreml(
-        model, 
-        output_path, 
+        checkpoint_path,
+        output_path,
         input_size=input_size,
-        class_labels=class_labels
+        class_labels=class_labels,
+        quantization=quantization,
+        num_classes=num_classes
     )
-
@@ -13,12 +13,50 @@ Usage:
 """
 
 import argparse
+import functools
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from .onnx_export import export_checkpoint_to_onnx
-from .coreml_export import export_checkpoint_to_coreml
+import torch
+
+from .checkpoint import load_checkpoint_model
+from .onnx_export import export_to_onnx
+from .coreml_export import MAX_BATCH_SIZE, export_to_coreml, torch_export_supported
+from .program import MIN_TORCH_ONNX_PROGRAM_VERSION, capture_program, torch_version_at_least
+
+
+_FORMAT_NAMES = {
+    'onnx': 'ONNX',
+    'coreml': 'CoreML'
+}
+
+
+def _collect_export(results: dict, fmt: str, run: Callable[[], str]) -> None:
+    """
+    Run or wait for one export job and record its output path.
+    
+    Failures are reported and leave the format's entry as None, so one
+    format failing does not prevent the other from being exported.
+    
+    Args:
+        results: Dictionary of exported paths, updated in place
+        fmt: Format key ('onnx' or 'coreml')
+        run: Callable returning the exported model path
+    """
+    name = _FORMAT_NAMES[fmt]
+    try:
+        results[fmt] = run()
+        print(f"✅ {name} export successful: {results[fmt]}\n")
+    except Exception as e:
+        print(f"❌ {name} export failed: {e}\n")
+
+
+def _export_from_program(export_func: Callable[..., str], program_path: str, **kwargs) -> str:
+    """Load a saved ExportedProgram and pass it to an exporter (runs in a worker process)."""
+    return export_func(torch.export.load(program_path), **kwargs)
 
 
 def export_all_formats(
@@ -28,7 +66,8 @@ def export_all_formats(
     input_size: int = 64,
     export_onnx: bool = True,
     export_coreml: bool = True,
-    class_labels: Optional[list] = None
+    class_labels: Optional[list] = None,
+    coreml_quantization: str = 'fp16'
 ) -> dict:
     """
     Export model to all supported formats for cross-platform deployment.
@@ -41,6 +80,7 @@ def export_all_formats(
         export_onnx: Whether to export ONNX format (default: True)
         export_coreml: Whether to export CoreML format (default: True)
         class_labels: Optional list of class labels (for metadata)
+        coreml_quantization: CoreML weight format: 'none', 'fp16' or 'int8' (default: 'fp16')
     
     Returns:
         Dictionary with paths to exported models:
@@ -70,40 +110,82 @@ def export_all_formats(
     print(f"Input size: {input_size}x{input_size}")
     print()
     
+    # Load the checkpoint once and share the model between both exporters
+    try:
+        model, model_input_size = load_checkpoint_model(
+            checkpoint_path,
+            num_classes=num_classes,
+            input_size=(input_size, input_size)
+        )
+    except Exception as e:
+        print(f"❌ Could not load checkpoint: {e}\n")
+        export_onnx = export_coreml = False
+    
+    # Independent export jobs: format -> (function, keyword arguments)
+    jobs = {}
+    
     # Export to ONNX (Windows/Linux/Cross-platform)
     if export_onnx:
-        try:
-            print("📦 Exporting to ONNX format (Windows/Linux/Cross-platform)...")
-            onnx_path = output_path / f"{checkpoint_name}.onnx"
-            export_checkpoint_to_onnx(
-                checkpoint_path=checkpoint_path,
-                output_path=str(onnx_path),
-                num_classes=num_classes,
-                input_size=(input_size, input_size),
-                device='cpu'
-            )
-            results['onnx'] = str(onnx_path)
-            print(f"✅ ONNX export successful: {onnx_path}\n")
-        except Exception as e:
-            print(f"❌ ONNX export failed: {e}\n")
+        print("📦 Exporting to ONNX format (Windows/Linux/Cross-platform)...")
+        jobs['onnx'] = (export_to_onnx, {
+            'model': model,
+            'output_path': str(output_path / f"{checkpoint_name}.onnx"),
+            'input_size': model_input_size
+        })
     
     # Export to CoreML (iOS/iPadOS/macOS)
     if export_coreml:
+        print("🍎 Exporting to CoreML format (iOS/iPadOS/macOS)...")
+        jobs['coreml'] = (export_to_coreml, {
+            'model': model,
+            'output_path': str(output_path / f"{checkpoint_name}.mlpackage"),
+            'input_size': model_input_size,
+            'class_labels': class_labels,
+            'quantization': coreml_quantization
+        })
+    
+    # Capture the graph once and lower the same program to both formats, so the
+    # ONNX and CoreML graphs cannot diverge. Only the ML Program CoreML targets
+    # accept an ExportedProgram.
+    program_dir = None
+    if (
+        len(jobs) > 1
+        and coreml_quantization != 'none'
+        and torch_export_supported()
+        and torch_version_at_least(MIN_TORCH_ONNX_PROGRAM_VERSION)
+    ):
         try:
-            print("🍎 Exporting to CoreML format (iOS/iPadOS/macOS)...")
-            coreml_path = output_path / f"{checkpoint_name}.mlpackage"
-            export_checkpoint_to_coreml(
-                checkpoint_path=checkpoint_path,
-                output_path=str(coreml_path),
-                num_classes=num_classes,
-                input_size=(input_size, input_size),
-                class_labels=class_labels,
-                device='cpu'
-            )
-            results['coreml'] = str(coreml_path)
-            print(f"✅ CoreML export successful: {coreml_path}\n")
+            print("Capturing model graph with torch.export...")
+            program_dir = tempfile.TemporaryDirectory()
+            program_path = os.path.join(program_dir.name, f"{checkpoint_name}.pt2")
+            program = capture_program(model, model_input_size, max_batch_size=MAX_BATCH_SIZE)
+            torch.export.save(program, program_path)
+            for fmt, (func, kwargs) in jobs.items():
+                kwargs = {key: value for key, value in kwargs.items() if key != 'model'}
+                jobs[fmt] = (_export_from_program, {
+                    'export_func': func,
+                    'program_path': program_path,
+                    **kwargs
+                })
         except Exception as e:
-            print(f"❌ CoreML export failed: {e}\n")
+            print(f"Warning: torch.export capture failed, exporting each format separately: {e}")
+    
+    if len(jobs) > 1:
+        # Both exports run a full convert pass; run them in separate processes
+        # since tracing holds the GIL
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {
+                fmt: executor.submit(func, **kwargs)
+                for fmt, (func, kwargs) in jobs.items()
+            }
+            for fmt, future in futures.items():
+                _collect_export(results, fmt, future.result)
+    else:
+        for fmt, (func, kwargs) in jobs.items():
+            _collect_export(results, fmt, functools.partial(func, **kwargs))
+    
+    if program_dir is not None:
+        program_dir.cleanup()
     
     # Summary
     print("=" * 60)
@@ -159,6 +241,13 @@ def main():
         action='store_true',
         help='Export only CoreML format'
     )
+    parser.add_argument(
+        '--coreml-quantization', 
+        type=str, 
+        choices=['none', 'fp16', 'int8'],
+        default='fp16',
+        help='CoreML weight format (default: fp16)'
+    )
     
     args = parser.parse_args()
     
@@ -173,7 +262,8 @@ def main():
         num_classes=args.num_classes,
         input_size=args.input_size,
         export_onnx=export_onnx,
-        export_coreml=export_coreml
+        export_coreml=export_coreml,
+        coreml_quantization=args.coreml_quantization
     )
 
 
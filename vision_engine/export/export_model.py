@@ -10,6 +10,7 @@ Usage:
 
 import argparse
 from .onnx_export import export_checkpoint_to_onnx
+from .onnx_quantize import MIN_TOP1_AGREEMENT, QUANTIZATION_MODES, quantize_onnx_model
 
 
 def main():
@@ -24,19 +25,48 @@ def main():
     parser.add_argument('--input_size', type=int, default=64,
                         help='Input image size (default: 64)')
     parser.add_argument('--device', type=str, default='cpu',
-                        help='Device to load model on (default: cpu)')
+                        help='Ignored; the model is always exported on CPU')
+    parser.add_argument('--verify_graph', action='store_true',
+                        help='Run the full onnx.checker validation on the exported model')
+    parser.add_argument('--no_verify_runtime', action='store_true',
+                        help='Skip the ONNX Runtime test inference')
+    parser.add_argument('--no_simplify', action='store_true',
+                        help='Skip onnx-simplifier and symbolic shape inference on the exported graph')
+    parser.add_argument('--quantize', type=str, choices=QUANTIZATION_MODES, default='none',
+                        help='INT8 quantization of the exported model (default: none)')
+    parser.add_argument('--calib_data_dir', type=str, default=None,
+                        help='Directory of preprocessed .npy samples for static quantization')
+    parser.add_argument('--min_top1_agreement', type=float, default=MIN_TOP1_AGREEMENT,
+                        help=f'Minimum INT8/FP32 top-1 agreement for the quantization '
+                             f'parity check (default: {MIN_TOP1_AGREEMENT})')
     
     args = parser.parse_args()
     
+    # Reject before spending time on the export
+    if args.quantize == 'static' and args.calib_data_dir is None:
+        parser.error("--quantize static requires --calib_data_dir")
+    
     export_checkpoint_to_onnx(
         checkpoint_path=args.checkpoint,
         output_path=args.output,
         num_classes=args.num_classes,
         input_size=(args.input_size, args.input_size),
-        device=args.device
+        device=args.device,
+        verify_graph=args.verify_graph,
+        verify_runtime=not args.no_verify_runtime,
+        simplify=not args.no_simplify
     )
     
     print(f"\nModel exported successfully to {args.output}")
+    
+    if args.quantize != 'none':
+        quantize_onnx_model(
+            args.output,
+            mode=args.quantize,
+            calib_data_dir=args.calib_data_dir,
+            input_size=(args.input_size, args.input_size),
+            min_top1_agreement=args.min_top1_agreement
+        )
 
 
 if __name__ == '__main__':
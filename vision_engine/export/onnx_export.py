@@ -2,75 +2,207 @@
 ONNX export utilities for the Vision Engine.
 """
 
+import numpy as np
 import torch
 import onnx
 import onnxruntime as ort
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import os
+import time
 
 from ..models import SymbolClassifierCNN
+from .checkpoint import load_checkpoint_model
+from .program import is_exported_program
+
+try:
+    import onnxsim
+    ONNXSIM_AVAILABLE = True
+except ImportError:
+    ONNXSIM_AVAILABLE = False
+
+try:
+    from onnxruntime.tools.symbolic_shape_infer import SymbolicShapeInference
+    SHAPE_INFERENCE_AVAILABLE = True
+except ImportError:
+    SHAPE_INFERENCE_AVAILABLE = False
+
+
+# Batch size of the tracing input. Tracing with batch 1 can fold the batch
+# dimension into downstream ops, so trace with a larger batch.
+TRACE_BATCH_SIZE = 2
+
+# Batch sizes timed by the runtime check. The check fails if batch 8 does not
+# come back with 8 rows, which catches a traced batch size leaking into the graph.
+BENCHMARK_BATCH_SIZES = (1, 8, 64)
+SHAPE_CHECK_BATCH_SIZE = 8
+
+
+def create_inference_session(model_path: str) -> ort.InferenceSession:
+    """
+    Create an ONNX Runtime CPU session with full graph optimizations.
+    
+    Args:
+        model_path: Path to the ONNX model
+    
+    Returns:
+        InferenceSession with all graph optimizations enabled, denormals
+        flushed to zero, and one intra-op thread per CPU core
+    """
+    session_options = ort.SessionOptions()
+    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session_options.add_session_config_entry("session.set_denormal_as_zero", "1")
+    session_options.intra_op_num_threads = os.cpu_count() or 1
+    return ort.InferenceSession(
+        model_path,
+        session_options,
+        providers=['CPUExecutionProvider']
+    )
+
+
+def _simplify_onnx_model(model_path: str):
+    """
+    Simplify an exported ONNX model in place.
+    
+    onnx-simplifier folds the Shape/Gather/Unsqueeze chains left behind by
+    dynamic axes, which lets ONNX Runtime fuse Conv+BN+ReLU; symbolic shape
+    inference then records the (batch-symbolic) shape of every intermediate.
+    Each step is skipped with a warning if it is unavailable or fails.
+    
+    Args:
+        model_path: Path to the ONNX model, overwritten with the result
+    """
+    onnx_model = onnx.load(model_path)
+    
+    if ONNXSIM_AVAILABLE:
+        print("Simplifying ONNX graph...")
+        simplified_model, check_ok = onnxsim.simplify(onnx_model)
+        if check_ok:
+            onnx_model = simplified_model
+        else:
+            print("Warning: Simplified ONNX model failed validation, keeping original")
+    else:
+        print("Warning: onnxsim not installed, skipping graph simplification")
+    
+    if SHAPE_INFERENCE_AVAILABLE:
+        print("Running symbolic shape inference...")
+        try:
+            inferred_model = SymbolicShapeInference.infer_shapes(onnx_model, auto_merge=True)
+            if inferred_model is not None:
+                onnx_model = inferred_model
+        except Exception as e:
+            print(f"Warning: Symbolic shape inference failed: {e}")
+    
+    onnx.save(onnx_model, model_path)
 
 
 def export_to_onnx(
-    model: SymbolClassifierCNN,
+    model: Union[SymbolClassifierCNN, str, 'torch.export.ExportedProgram'],
     output_path: str,
     input_size: Tuple[int, int] = (64, 64),
     opset_version: int = 11,
-    verify: bool = True
+    verify_graph: bool = False,
+    verify_runtime: bool = True,
+    num_classes: int = 369,
+    simplify: bool = True
 ) -> str:
     """
     Export PyTorch model to ONNX format.
     
     Args:
-        model: Trained SymbolClassifierCNN model
+        model: Trained SymbolClassifierCNN model, a checkpoint path to load it from,
+               or an ExportedProgram from capture_program() to lower as-is
         output_path: Path to save the ONNX model
         input_size: Input image size (height, width)
-        opset_version: ONNX opset version (default: 11)
-        verify: Whether to verify the exported model (default: True)
+        opset_version: ONNX opset version (default: 11). ExportedPrograms go through
+                       the dynamo exporter, which uses its own default opset.
+        verify_graph: Whether to run the full onnx.checker validation (default: False;
+                      ONNX Runtime validates the graph again when it loads it)
+        verify_runtime: Whether to run a test inference with ONNX Runtime (default: True)
+        num_classes: Number of classes when loading from a checkpoint (default: 369)
+        simplify: Whether to constant-fold the graph with onnx-simplifier and
+                  annotate it with symbolic shape inference (default: True)
     
     Returns:
         Path to the exported ONNX model
     """
-    model.eval()
+    if isinstance(model, str):
+        model, input_size = load_checkpoint_model(model, num_classes, input_size)
     
     # Create dummy input
-    dummy_input = torch.randn(1, 1, input_size[0], input_size[1])
+    dummy_input = torch.randn(TRACE_BATCH_SIZE, 1, input_size[0], input_size[1])
     
     # Export to ONNX
     print(f"Exporting model to ONNX format...")
     print(f"Input shape: {dummy_input.shape}")
     print(f"Output path: {output_path}")
     
-    torch.onnx.export(
-        model,
-        dummy_input,
-        output_path,
-        export_params=True,
-        opset_version=opset_version,
-        do_constant_folding=True,
-        input_names=['input'],
-        output_names=['output'],
-        dynamic_axes={
-            'input': {0: 'batch_size'},
-            'output': {0: 'batch_size'}
-        }
-    )
+    if is_exported_program(model):
+        # Already captured (with a dynamic batch dimension); lower it directly
+        torch.onnx.export(
+            model,
+            (dummy_input,),
+            output_path,
+            dynamo=True,
+            input_names=['input'],
+            output_names=['output']
+        )
+    else:
+        model.eval()
+        torch.onnx.export(
+            model,
+            dummy_input,
+            output_path,
+            export_params=True,
+            opset_version=opset_version,
+            do_constant_folding=True,
+            input_names=['input'],
+            output_names=['output'],
+            dynamic_axes={
+                'input': {0: 'batch_size'},
+                'output': {0: 'batch_size'}
+            }
+        )
+    
+    if simplify:
+        _simplify_onnx_model(output_path)
     
     print(f"Model exported successfully to {output_path}")
     
     # Verify the exported model
-    if verify:
+    if verify_graph:
         print("Verifying exported model...")
         onnx_model = onnx.load(output_path)
         onnx.checker.check_model(onnx_model)
         print("Model verification passed!")
-        
-        # Test inference with ONNX Runtime
+    
+    if verify_runtime:
+        # Test inference with ONNX Runtime on the tracing input
         print("Testing ONNX Runtime inference...")
-        ort_session = ort.InferenceSession(output_path)
+        ort_session = create_inference_session(output_path)
         ort_inputs = {ort_session.get_inputs()[0].name: dummy_input.numpy()}
         ort_outputs = ort_session.run(None, ort_inputs)
         print(f"ONNX Runtime output shape: {ort_outputs[0].shape}")
+        
+        # Time representative batch sizes and check the batch axis stays dynamic
+        input_name = ort_session.get_inputs()[0].name
+        output_classes = ort_outputs[0].shape[1]
+        for batch_size in BENCHMARK_BATCH_SIZES:
+            x = np.random.randn(batch_size, 1, input_size[0], input_size[1]).astype(np.float32)
+            for _ in range(3):
+                outputs = ort_session.run(None, {input_name: x})
+            if batch_size == SHAPE_CHECK_BATCH_SIZE:
+                expected_shape = (batch_size, output_classes)
+                if outputs[0].shape != expected_shape:
+                    raise RuntimeError(
+                        f"ONNX model returned shape {outputs[0].shape} for batch size "
+                        f"{batch_size}, expected {expected_shape}; the batch dimension "
+                        f"is not dynamic"
+                    )
+            start = time.perf_counter()
+            for _ in range(20):
+                ort_session.run(None, {input_name: x})
+            elapsed = (time.perf_counter() - start) / 20
+            print(f"  batch size {batch_size}: {elapsed * 1e3:.2f} ms")
         print("ONNX Runtime inference test passed!")
     
     return output_path
@@ -81,46 +213,36 @@ def export_checkpoint_to_onnx(
     output_path: str,
     num_classes: int = 369,
     input_size: Tuple[int, int] = (64, 64),
-    device: str = 'cpu'
+    device: str = 'cpu',
+    verify_graph: bool = False,
+    verify_runtime: bool = True,
+    simplify: bool = True
 ) -> str:
     """
     Export a model checkpoint to ONNX format.
     
-    Note: ONNX export should typically be done on CPU to ensure compatibility.
-    If device is 'mps' or 'cuda', the model will be loaded on that device but
-    moved to CPU for export.
-    """
-    """
-    Export a model checkpoint to ONNX format.
+    The checkpoint is always loaded and exported on CPU, which ONNX export
+    requires.
     
     Args:
         checkpoint_path: Path to PyTorch checkpoint file
         output_path: Path to save the ONNX model
         num_classes: Number of classes (default: 369)
         input_size: Input image size (default: (64, 64))
-        device: Device to load the model on (default: 'cpu')
+        device: Ignored; accepted for compatibility with existing callers
+        verify_graph: Whether to run the full onnx.checker validation (default: False)
+        verify_runtime: Whether to run a test inference with ONNX Runtime (default: True)
+        simplify: Whether to simplify and shape-infer the exported graph (default: True)
     
     Returns:
         Path to the exported ONNX model
     """
-    from ..models import create_model
-    
-    # Load checkpoint (use CPU for loading to ensure compatibility)
-    load_device = 'cpu'  # Always load on CPU for ONNX export compatibility
-    checkpoint = torch.load(checkpoint_path, map_location=load_device)
-    
-    # Get model config from checkpoint if available
-    if 'model_config' in checkpoint:
-        config = checkpoint['model_config']
-        num_classes = config.get('num_classes', num_classes)
-        input_size = (config.get('input_size', input_size[0]), input_size[1])
-    
-    # Create model and load on CPU (ONNX export requires CPU)
-    model = create_model(num_classes=num_classes, input_size=input_size[0])
-    model.load_state_dict(checkpoint['model_state_dict'])
-    model.eval()
-    model = model.to('cpu')  # Ensure model is on CPU for export
-    
-    # Export (ONNX export must be done on CPU)
-    return export_to_onnx(model, output_path, input_size=input_size)
-
+    return export_to_onnx(
+        checkpoint_path,
+        output_path,
+        input_size=input_size,
+        verify_graph=verify_graph,
+        verify_runtime=verify_runtime,
+        num_classes=num_classes,
+        simplify=simplify
+    )
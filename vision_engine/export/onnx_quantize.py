@@ -0,0 +1,177 @@
+"""
+INT8 post-training quantization for exported ONNX models.
+
+Supports:
+- dynamic: weights quantized ahead of time, activations at run time (no data needed)
+- static: weights and activations quantized using calibration samples (QDQ format)
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static
+)
+
+from .onnx_export import create_inference_session
+
+
+QUANTIZATION_MODES = ('none', 'dynamic', 'static')
+
+# Minimum fraction of inputs on which the INT8 and FP32 models must agree on
+# the top-1 class for the parity check to pass
+MIN_TOP1_AGREEMENT = 0.95
+
+
+def _iter_calibration_samples(
+    calib_data_dir: str,
+    input_size: Tuple[int, int],
+    max_samples: int
+) -> Iterator[np.ndarray]:
+    """
+    Yield preprocessed (1, 1, H, W) float32 samples from .npy files.
+    
+    Each file may hold a single sample or a batch; files are read in sorted
+    order until max_samples samples have been produced.
+    """
+    count = 0
+    for path in sorted(Path(calib_data_dir).glob("*.npy")):
+        samples = np.load(path).astype(np.float32).reshape(-1, 1, input_size[0], input_size[1])
+        for sample in samples:
+            if count >= max_samples:
+                return
+            yield sample[np.newaxis]
+            count += 1
+
+
+class NpyCalibrationDataReader(CalibrationDataReader):
+    """Feeds preprocessed .npy samples to ONNX Runtime static quantization."""
+    
+    def __init__(
+        self,
+        calib_data_dir: str,
+        input_name: str = 'input',
+        input_size: Tuple[int, int] = (64, 64),
+        max_samples: int = 300
+    ):
+        """
+        Initialize the calibration reader.
+        
+        Args:
+            calib_data_dir: Directory of .npy files holding preprocessed float32 images
+            input_name: Name of the model input
+            input_size: Input image size (height, width)
+            max_samples: Maximum number of calibration samples to use
+        """
+        self.input_name = input_name
+        self._samples = _iter_calibration_samples(calib_data_dir, input_size, max_samples)
+    
+    def get_next(self) -> Optional[dict]:
+        """Return the next calibration input, or None when exhausted."""
+        sample = next(self._samples, None)
+        if sample is None:
+            return None
+        return {self.input_name: sample}
+
+
+def quantize_onnx_model(
+    model_path: str,
+    mode: str = 'dynamic',
+    output_path: Optional[str] = None,
+    calib_data_dir: Optional[str] = None,
+    input_size: Tuple[int, int] = (64, 64),
+    num_calib_samples: int = 300,
+    verify: bool = True,
+    min_top1_agreement: float = MIN_TOP1_AGREEMENT
+) -> Optional[str]:
+    """
+    Quantize an exported ONNX model to INT8.
+    
+    Args:
+        model_path: Path to the FP32 ONNX model
+        mode: 'none', 'dynamic' or 'static' (default: 'dynamic')
+        output_path: Path for the quantized model (default: <model>.int8.onnx)
+        calib_data_dir: Directory of preprocessed .npy samples (required for 'static')
+        input_size: Input image size (height, width)
+        num_calib_samples: Maximum number of calibration samples (default: 300)
+        verify: Whether to compare quantized and FP32 outputs (default: True)
+        min_top1_agreement: Minimum top-1 agreement with the FP32 model (default: 0.95).
+                            Below it the parity check raises when measured on
+                            calibration samples, and only warns on random inputs.
+    
+    Returns:
+        Path to the quantized model, or None if mode is 'none'
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"mode must be one of {QUANTIZATION_MODES}, got {mode!r}")
+    if mode == 'none':
+        return None
+    
+    if output_path is None:
+        output_path = str(Path(model_path).with_suffix('.int8.onnx'))
+    
+    print(f"Quantizing ONNX model to INT8 ({mode})...")
+    print(f"Output path: {output_path}")
+    
+    if mode == 'dynamic':
+        quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    else:
+        if calib_data_dir is None:
+            raise ValueError("Static quantization requires calib_data_dir")
+        reader = NpyCalibrationDataReader(
+            calib_data_dir,
+            input_size=input_size,
+            max_samples=num_calib_samples
+        )
+        quantize_static(
+            model_path,
+            output_path,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QInt8,
+            weight_type=QuantType.QInt8
+        )
+    
+    print(f"Quantized model saved to {output_path}")
+    
+    # Compare against the FP32 model
+    if verify:
+        print("Comparing quantized and FP32 outputs...")
+        if calib_data_dir is not None:
+            samples = list(_iter_calibration_samples(calib_data_dir, input_size, 32))
+            inputs = np.concatenate(samples) if samples else None
+        else:
+            inputs = None
+        used_random_inputs = inputs is None
+        if used_random_inputs:
+            inputs = np.random.rand(8, 1, input_size[0], input_size[1]).astype(np.float32)
+        
+        fp32_session = create_inference_session(model_path)
+        int8_session = create_inference_session(output_path)
+        input_name = fp32_session.get_inputs()[0].name
+        fp32_outputs = fp32_session.run(None, {input_name: inputs})[0]
+        int8_outputs = int8_session.run(None, {input_name: inputs})[0]
+        
+        max_diff = float(np.abs(fp32_outputs - int8_outputs).max())
+        top1_agreement = float((fp32_outputs.argmax(axis=1) == int8_outputs.argmax(axis=1)).mean())
+        print(f"Max absolute output difference: {max_diff:.4f}")
+        print(f"Top-1 agreement with FP32: {top1_agreement:.2%}")
+        if top1_agreement >= min_top1_agreement:
+            print("Quantization parity check passed!")
+        elif used_random_inputs:
+            # Random inputs give near-uniform logits, so disagreement is only indicative
+            print(f"Warning: Top-1 agreement below {min_top1_agreement:.2%} on random inputs; "
+                  f"pass calib_data_dir to check on real samples")
+        else:
+            raise RuntimeError(
+                f"Quantized model agrees with FP32 on only {top1_agreement:.2%} of "
+                f"top-1 predictions (minimum {min_top1_agreement:.2%}); "
+                f"try more calibration samples or keep the FP32 model"
+            )
+    
+    return output_path
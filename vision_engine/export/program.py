@@ -0,0 +1,66 @@
+"""
+torch.export graph capture shared by the ONNX and CoreML exporters.
+
+Capturing the model once and lowering the same ExportedProgram to both
+formats keeps the two exported graphs identical.
+"""
+
+import itertools
+import torch
+from typing import Optional, Tuple
+
+from ..models import SymbolClassifierCNN
+
+
+# Oldest torch release with torch.export and the torch.export.Dim dynamic-shape
+# API used by capture_program() (torch.export itself appeared in 2.1)
+MIN_TORCH_EXPORT_VERSION = (2, 2)
+
+# Oldest torch release whose ONNX exporter accepts an ExportedProgram (dynamo=True)
+MIN_TORCH_ONNX_PROGRAM_VERSION = (2, 5)
+
+
+def version_tuple(version: str) -> Tuple[int, ...]:
+    """Parse the leading numeric components of a version string ("2.1.0+cpu" -> (2, 1, 0))."""
+    parts = []
+    for part in version.split('+')[0].split('.'):
+        digits = ''.join(itertools.takewhile(str.isdigit, part))
+        if not digits:
+            break
+        parts.append(int(digits))
+    return tuple(parts)
+
+
+def torch_version_at_least(minimum: Tuple[int, ...]) -> bool:
+    """Check the installed torch version against a minimum (major, minor) tuple."""
+    return version_tuple(torch.__version__) >= minimum
+
+
+def is_exported_program(obj) -> bool:
+    """Check whether obj is a torch.export.ExportedProgram (False on torch without torch.export)."""
+    export = getattr(torch, 'export', None)
+    return export is not None and isinstance(obj, export.ExportedProgram)
+
+
+def capture_program(
+    model: SymbolClassifierCNN,
+    input_size: Tuple[int, int] = (64, 64),
+    max_batch_size: Optional[int] = None
+) -> 'torch.export.ExportedProgram':
+    """
+    Capture the model graph with torch.export, keeping the batch dimension dynamic.
+    
+    Args:
+        model: Trained SymbolClassifierCNN model
+        input_size: Input image size (height, width)
+        max_batch_size: Optional upper bound for the batch dimension
+    
+    Returns:
+        ExportedProgram accepting inputs of shape (batch_size, 1, height, width)
+    """
+    model.eval()
+    
+    # torch.export specializes sample sizes of 0 and 1, so trace with a batch of 2
+    sample_input = torch.randn(2, 1, input_size[0], input_size[1])
+    batch_size = torch.export.Dim("batch_size", min=1, max=max_batch_size)
+    return torch.export.export(model, (sample_input,), dynamic_shapes=({0: batch_size},))
@@ -3,7 +3,7 @@ Training utilities and scripts for the Vision Engine.
 """
 
 from .trainer import Trainer
-from .metrics import calculate_top_k_accuracy
+from .metrics import calculate_top_k_accuracy, topk_correct_counts
 
-__all__ = ["Trainer", "calculate_top_k_accuracy"]
+__all__ = ["Trainer", "calculate_top_k_accuracy", "topk_correct_counts"]
 
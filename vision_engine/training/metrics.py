@@ -3,7 +3,7 @@ Evaluation metrics for symbol classification.
 """
 
 import torch
-from typing import Tuple
+from typing import Sequence, Tuple
 
 
 def calculate_top_k_accuracy(
@@ -30,6 +30,33 @@ def calculate_top_k_accuracy(
     return top_k_acc
 
 
+def topk_correct_counts(
+    outputs: torch.Tensor,
+    targets: torch.Tensor,
+    ks: Sequence[int] = (1, 5)
+) -> Tuple[torch.Tensor, ...]:
+    """
+    Count correct top-k predictions in a batch, without leaving the device.
+    
+    A single topk over the largest k serves every k, and the counts stay as
+    tensors so a training loop can sum them per batch and transfer only the
+    final totals.
+    
+    Args:
+        outputs: Model predictions (logits) of shape (batch_size, num_classes)
+        targets: Ground truth labels of shape (batch_size,)
+        ks: Values of k to count
+    
+    Returns:
+        Tuple with one zero-dim integer tensor per k: the number of samples whose
+        target is among the top-k predictions
+    """
+    with torch.no_grad():
+        _, top_k_indices = torch.topk(outputs, max(ks), dim=1)
+        correct = top_k_indices.eq(targets.unsqueeze(1))
+        return tuple(correct[:, :k].any(dim=1).sum() for k in ks)
+
+
 def calculate_accuracy_metrics(
     predictions: torch.Tensor,
     targets: torch.Tensor
@@ -44,8 +71,8 @@ def calculate_accuracy_metrics(
     Returns:
         Tuple of (top_1_accuracy, top_5_accuracy)
     """
-    top_1_acc = calculate_top_k_accuracy(predictions, targets, k=1)
-    top_5_acc = calculate_top_k_accuracy(predictions, targets, k=5)
+    # One top-5 pass serves both: top-1 is its first column
+    correct_1, correct_5 = topk_correct_counts(predictions, targets, ks=(1, 5))
+    num_samples = targets.size(0)
     
-    return top_1_acc, top_5_acc
-
+    return correct_1.item() / num_samples, correct_5.item() / num_samples
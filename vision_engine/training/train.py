@@ -17,7 +17,15 @@ from torch.utils.data import DataLoader
 
 from ..data import get_hasyv2_dataloaders
 from ..models import create_model
-from ..utils import get_device, get_device_info, set_seed, get_optimal_num_workers
+from ..utils import (
+    get_device,
+    get_device_info,
+    set_seed,
+    enable_tf32,
+    get_optimal_num_workers,
+    make_generator,
+    seed_worker
+)
 from .trainer import Trainer
 
 
@@ -51,24 +59,34 @@ def main():
                         help='Weight decay (default: 1e-4)')
     parser.add_argument('--num_workers', type=int, default=4,
                         help='Number of data loading workers (default: 4)')
+    parser.add_argument('--amp', action='store_true',
+                        help='Use automatic mixed precision on CUDA/MPS')
+    parser.add_argument('--no-compile', action='store_true',
+                        help='Disable torch.compile for the model')
     
     # Other arguments
     parser.add_argument('--save_dir', type=str, default='./checkpoints',
                         help='Directory to save checkpoints (default: ./checkpoints)')
     parser.add_argument('--seed', type=int, default=42,
                         help='Random seed (default: 42)')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='Use deterministic cuDNN kernels (slower)')
     parser.add_argument('--augment', action='store_true', default=True,
                         help='Use data augmentation for training')
     
     args = parser.parse_args()
     
     # Set random seed
-    set_seed(args.seed)
+    set_seed(args.seed, strict=args.deterministic)
     
     # Get device (prioritize MPS for Mac, then CUDA, then CPU)
     device, device_info = get_device_info()
     print(f"Using device: {device} ({device_info})")
     
+    # Use TF32 Tensor Cores for FP32 matmul/conv on CUDA
+    if device.type == 'cuda':
+        enable_tf32()
+    
     # Adjust num_workers based on device
     if args.num_workers == 4:  # Only override if using default
         args.num_workers = get_optimal_num_workers(device)
@@ -84,7 +102,14 @@ def main():
         batch_size=args.batch_size,
         num_workers=args.num_workers,
         target_size=(args.input_size, args.input_size),
-        augment_train=args.augment
+        augment_train=args.augment,
+        pin_memory=(device.type == 'cuda'),  # Lets batch copies overlap with compute
+        generator=make_generator(args.seed),  # Reproducible shuffling and worker seeds
+        worker_init_fn=seed_worker,
+        # Keep workers alive across epochs and let each queue a few batches ahead
+        # (both options require at least one worker)
+        persistent_workers=args.num_workers > 0,
+        prefetch_factor=4 if args.num_workers > 0 else None
     )
     
     # Create model
@@ -104,7 +129,9 @@ def main():
         device=device,
         learning_rate=args.learning_rate,
         weight_decay=args.weight_decay,
-        save_dir=args.save_dir
+        save_dir=args.save_dir,
+        use_amp=args.amp,
+        compile_model=not args.no_compile
     )
     
     # Train
@@ -6,13 +6,31 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader
-from typing import Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import contextlib
 import os
 from tqdm import tqdm
 import json
 
 from ..models import SymbolClassifierCNN
-from .metrics import calculate_accuracy_metrics
+from .metrics import topk_correct_counts
+
+
+# Training steps between progress-bar loss updates (each update syncs the device)
+PROGRESS_INTERVAL = 50
+
+
+def _snapshot_to_cpu(obj: Any) -> Any:
+    """Copy a (nested) state dict, cloning every tensor to CPU."""
+    if isinstance(obj, torch.Tensor):
+        # One copy: .cpu() alone would alias tensors that are already on CPU
+        return obj.detach().to('cpu', copy=True)
+    if isinstance(obj, dict):
+        return {key: _snapshot_to_cpu(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_snapshot_to_cpu(value) for value in obj)
+    return obj
 
 
 class Trainer:
@@ -28,9 +46,24 @@ class Trainer:
         device: torch.device,
         learning_rate: float = 0.001,
         weight_decay: float = 1e-4,
-        save_dir: str = "./checkpoints"
+        save_dir: str = "./checkpoints",
+        use_amp: bool = False,
+        compile_model: bool = True
     ):
         self.model = model.to(device)
+        # Tensor Core conv kernels prefer NHWC; inputs are converted to match
+        self.channels_last = device.type == 'cuda'
+        if self.channels_last:
+            self.model = self.model.to(memory_format=torch.channels_last)
+        # Uncompiled module, used for checkpoints so state_dict keys carry no
+        # torch.compile "_orig_mod." prefix
+        self._raw_model = self.model
+        
+        # Compile the forward/backward (torch.compile does not support MPS).
+        # reduce-overhead adds CUDA graphs, which only help on CUDA.
+        if compile_model and hasattr(torch, 'compile') and device.type in ('cuda', 'cpu'):
+            compile_mode = 'reduce-overhead' if device.type == 'cuda' else 'default'
+            self.model = torch.compile(self.model, mode=compile_mode, fullgraph=False)
         self.train_loader = train_loader
         self.val_loader = val_loader
         self.device = device
@@ -39,15 +72,43 @@ class Trainer:
         # Create save directory
         os.makedirs(save_dir, exist_ok=True)
         
+        # Input size is fixed, so let cuDNN pick the fastest conv algorithms once
+        # (unless deterministic kernels were requested, see utils.set_seed)
+        if device.type == 'cuda' and not torch.backends.cudnn.deterministic:
+            torch.backends.cudnn.benchmark = True
+        
+        # Mixed precision: autocast on CUDA and MPS. CUDA prefers bfloat16, which
+        # needs no loss scaling; the float16 fallback uses a GradScaler. MPS runs
+        # float16 autocast without a scaler.
+        self.use_amp = use_amp and device.type in ('cuda', 'mps')
+        if device.type == 'cuda' and torch.cuda.is_bf16_supported():
+            self.amp_dtype = torch.bfloat16
+        else:
+            self.amp_dtype = torch.float16
+        self.scaler = torch.cuda.amp.GradScaler(
+            enabled=self.use_amp and device.type == 'cuda' and self.amp_dtype == torch.float16
+        )
+        
         # Loss function
         self.criterion = nn.CrossEntropyLoss()
         
-        # Optimizer
-        self.optimizer = optim.Adam(
-            self.model.parameters(),
-            lr=learning_rate,
-            weight_decay=weight_decay
-        )
+        # Optimizer: one fused kernel (CUDA) or multi-tensor foreach updates
+        # (CPU/MPS) per step instead of a Python loop over parameters
+        try:
+            self.optimizer = optim.Adam(
+                self.model.parameters(),
+                lr=learning_rate,
+                weight_decay=weight_decay,
+                fused=(device.type == 'cuda'),
+                foreach=(device.type != 'cuda')
+            )
+        except (TypeError, RuntimeError):
+            # Implementation not available for this torch build/device
+            self.optimizer = optim.Adam(
+                self.model.parameters(),
+                lr=learning_rate,
+                weight_decay=weight_decay
+            )
         
         # Learning rate scheduler
         self.scheduler = optim.lr_scheduler.ReduceLROnPlateau(
@@ -57,6 +118,10 @@ class Trainer:
             patience=5
         )
         
+        # Checkpoints are written by a background thread, at most one at a time
+        self._save_pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=1)
+        self._save_future: Optional[Future] = None
+        
         # Training history
         self.history = {
             'train_loss': [],
@@ -67,41 +132,55 @@ class Trainer:
             'val_top5': []
         }
     
+    def _autocast(self):
+        """Autocast context when AMP is on; a no-op context otherwise."""
+        if self.use_amp:
+            return torch.autocast(device_type=self.device.type, dtype=self.amp_dtype)
+        return contextlib.nullcontext()
+    
     def train_epoch(self) -> Dict[str, float]:
         """Train for one epoch."""
         self.model.train()
-        running_loss = 0.0
-        all_predictions = []
-        all_targets = []
+        # Loss and correct-prediction sums stay on the device until the end of the epoch
+        loss_sum = torch.zeros((), device=self.device)
+        top1_correct = torch.zeros((), dtype=torch.long, device=self.device)
+        top5_correct = torch.zeros((), dtype=torch.long, device=self.device)
+        num_samples = 0
         
         pbar = tqdm(self.train_loader, desc="Training")
-        for images, labels, _ in pbar:
-            images = images.to(self.device)
-            labels = labels.to(self.device)
+        for step, (images, labels, _) in enumerate(pbar):
+            images = images.to(self.device, non_blocking=True)
+            if self.channels_last:
+                images = images.contiguous(memory_format=torch.channels_last)
+            labels = labels.to(self.device, non_blocking=True)
             
             # Forward pass
-            self.optimizer.zero_grad()
-            outputs = self.model(images)
-            loss = self.criterion(outputs, labels)
+            self.optimizer.zero_grad(set_to_none=True)
+            with self._autocast():
+                outputs = self.model(images)
+                loss = self.criterion(outputs, labels)
             
-            # Backward pass
-            loss.backward()
-            self.optimizer.step()
+            # Backward pass (the scaler is a pass-through when disabled)
+            self.scaler.scale(loss).backward()
+            self.scaler.step(self.optimizer)
+            self.scaler.update()
             
             # Statistics
-            running_loss += loss.item()
-            all_predictions.append(outputs.detach().cpu())
-            all_targets.append(labels.detach().cpu())
+            loss_sum += loss.detach()
+            correct1, correct5 = topk_correct_counts(outputs.detach(), labels)
+            top1_correct += correct1
+            top5_correct += correct5
+            num_samples += labels.size(0)
             
             # Update progress bar
-            pbar.set_postfix({'loss': loss.item()})
+            if step % PROGRESS_INTERVAL == 0:
+                pbar.set_postfix({'loss': loss.item()})
         
         # Calculate metrics
-        all_predictions = torch.cat(all_predictions, dim=0)
-        all_targets = torch.cat(all_targets, dim=0)
-        top1_acc, top5_acc = calculate_accuracy_metrics(all_predictions, all_targets)
+        top1_acc = top1_correct.item() / num_samples
+        top5_acc = top5_correct.item() / num_samples
         
-        avg_loss = running_loss / len(self.train_loader)
+        avg_loss = loss_sum.item() / len(self.train_loader)
         
         return {
             'loss': avg_loss,
@@ -112,31 +191,37 @@ class Trainer:
     def validate(self) -> Dict[str, float]:
         """Validate the model."""
         self.model.eval()
-        running_loss = 0.0
-        all_predictions = []
-        all_targets = []
+        # Loss and correct-prediction sums stay on the device until the end of the epoch
+        loss_sum = torch.zeros((), device=self.device)
+        top1_correct = torch.zeros((), dtype=torch.long, device=self.device)
+        top5_correct = torch.zeros((), dtype=torch.long, device=self.device)
+        num_samples = 0
         
         with torch.no_grad():
             pbar = tqdm(self.val_loader, desc="Validation")
             for images, labels, _ in pbar:
-                images = images.to(self.device)
-                labels = labels.to(self.device)
+                images = images.to(self.device, non_blocking=True)
+                if self.channels_last:
+                    images = images.contiguous(memory_format=torch.channels_last)
+                labels = labels.to(self.device, non_blocking=True)
                 
                 # Forward pass
-                outputs = self.model(images)
-                loss = self.criterion(outputs, labels)
+                with self._autocast():
+                    outputs = self.model(images)
+                    loss = self.criterion(outputs, labels)
                 
                 # Statistics
-                running_loss += loss.item()
-                all_predictions.append(outputs.cpu())
-                all_targets.append(labels.cpu())
+                loss_sum += loss.detach()
+                correct1, correct5 = topk_correct_counts(outputs, labels)
+                top1_correct += correct1
+                top5_correct += correct5
+                num_samples += labels.size(0)
         
         # Calculate metrics
-        all_predictions = torch.cat(all_predictions, dim=0)
-        all_targets = torch.cat(all_targets, dim=0)
-        top1_acc, top5_acc = calculate_accuracy_metrics(all_predictions, all_targets)
+        top1_acc = top1_correct.item() / num_samples
+        top5_acc = top5_correct.item() / num_samples
         
-        avg_loss = running_loss / len(self.val_loader)
+        avg_loss = loss_sum.item() / len(self.val_loader)
         
         return {
             'loss': avg_loss,
@@ -205,6 +290,7 @@ class Trainer:
             metrics=val_metrics
         )
         self.save_history(os.path.join(self.save_dir, 'training_history.json'))
+        self._wait_for_save()
         
         return self.history
     
@@ -214,24 +300,56 @@ class Trainer:
         epoch: int,
         metrics: Dict[str, float]
     ):
-        """Save model checkpoint."""
-        checkpoint = {
+        """
+        Save model checkpoint in the background.
+        
+        The state is copied to CPU before returning, so training can continue
+        while the snapshot is serialized. train() waits for its last save;
+        call close() to also stop the save thread.
+        """
+        checkpoint = _snapshot_to_cpu({
             'epoch': epoch,
-            'model_state_dict': self.model.state_dict(),
+            'model_state_dict': self._raw_model.state_dict(),
             'optimizer_state_dict': self.optimizer.state_dict(),
             'scheduler_state_dict': self.scheduler.state_dict(),
             'metrics': metrics,
             'model_config': {
-                'num_classes': self.model.num_classes,
-                'input_size': self.model.input_size
+                'num_classes': self._raw_model.num_classes,
+                'input_size': self._raw_model.input_size
             }
-        }
-        torch.save(checkpoint, filepath)
+        })
+        
+        # Keep at most one save in flight
+        self._wait_for_save()
+        if self._save_pool is None:
+            self._save_pool = ThreadPoolExecutor(max_workers=1)
+        self._save_future = self._save_pool.submit(torch.save, checkpoint, filepath)
+    
+    def _wait_for_save(self):
+        """Block until the pending checkpoint save (if any) has finished."""
+        if self._save_future is not None:
+            self._save_future.result()
+            self._save_future = None
+    
+    def close(self):
+        """
+        Wait for pending checkpoint saves and stop the save thread.
+        
+        The Trainer stays usable; a later save starts a new thread.
+        """
+        self._wait_for_save()
+        if self._save_pool is not None:
+            self._save_pool.shutdown(wait=True)
+            self._save_pool = None
     
     def load_checkpoint(self, filepath: str):
         """Load model checkpoint."""
-        checkpoint = torch.load(filepath, map_location=self.device)
-        self.model.load_state_dict(checkpoint['model_state_dict'])
+        # Don't read a checkpoint that is still being written
+        self._wait_for_save()
+        # Memory-map instead of reading the whole file. No assign=True here: the
+        # optimizer already references the model's current parameters.
+        checkpoint = torch.load(filepath, map_location=self.device, mmap=True)
+        self._raw_model.load_state_dict(checkpoint['model_state_dict'])
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
         self.scheduler.load_state_dict(checkpoint['scheduler_state_dict'])
         return checkpoint